@@ -3,7 +3,11 @@ from flask_cors import CORS
 from dotenv import load_dotenv
 from models import db
 from config import Config
+from logging_config import configure_logging
+from services.db_pool import engine_options, install_pool_metrics, install_statement_timeout
+from services.replica_router import replica_router
 import os
+import logging
 from routes.transactions import transactions
 from routes.auth import auth
 from flask_login import LoginManager
@@ -15,26 +19,50 @@ from routes.users import users
 from flask_apscheduler import APScheduler
 from services.recurring_transaction_service import RecurringTransactionService
 from routes.admin import admin_bp
+from routes.analytics import analytics_bp
+from services.rollup_service import RollupService
+import click
 # Load environment variables
 load_dotenv()
 
+# Configure logging once for the whole process
+configure_logging(Config.LOG_LEVEL)
+logger = logging.getLogger(__name__)
+
 # Initialize Flask app
 app = Flask(__name__)
 CORS(app, 
      supports_credentials=True,
      origins=["http://localhost:3000"],
-     allow_headers=["Content-Type", "Authorization"],
+     allow_headers=["Content-Type", "Authorization", "X-Last-Write"],
+     expose_headers=["X-Last-Write"],
      methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"])
 
 # Configure app
 app.config.from_object(Config)
 
-# Initialize database
+# True when a flask CLI command other than `flask run` (db upgrade,
+# rebuild-rollups, ...) is importing the app
+cli_context = click.get_current_context(silent=True)
+RUNNING_CLI_COMMAND = cli_context is not None and cli_context.info_name != 'run'
+
+if RUNNING_CLI_COMMAND:
+    # Migrations and maintenance jobs may run longer than any web request
+    app.config['DB_STATEMENT_TIMEOUT_MS'] = 0
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(statement_timeout_ms=0, **Config.DB_POOL_OPTIONS)
+
+# Initialize database and read replicas
 db.init_app(app)
+replica_router.init_app(app)
 
-# Create tables
+# Create tables and attach engine instrumentation
 with app.app_context():
-    db.create_all()
+    install_pool_metrics(db.engine)
+    if app.config['DB_PGBOUNCER'] and app.config['DB_STATEMENT_TIMEOUT_MS']:
+        install_statement_timeout(db.engine, app.config['DB_STATEMENT_TIMEOUT_MS'])
+    # Leave the schema to migrations when running `flask db ...`
+    if not RUNNING_CLI_COMMAND:
+        db.create_all()
 migrate = Migrate(app, db)
 
 # Initialize Flask-Login
@@ -56,34 +84,72 @@ app.register_blueprint(categories_bp, url_prefix='/categories')
 app.register_blueprint(budgets, url_prefix='/budgets')
 app.register_blueprint(users, url_prefix='/users')
 app.register_blueprint(admin_bp, url_prefix='/admin')
+app.register_blueprint(analytics_bp, url_prefix='/analytics')
+
+def run_recurring_generation():
+    """
+    Scheduler job: generate due recurring transactions unless another worker
+    already is. Returns the per-schedule counts, or None when skipped or failed.
+    """
+    with app.app_context():
+        try:
+            created = RecurringTransactionService.generate_exclusively(catch_up=True)
+        except Exception:
+            logger.exception("Error generating recurring transactions")
+            db.session.rollback()
+            return None
+        # The service logs the totals, or that the run was skipped
+        for schedule_id, count in sorted((created or {}).items()):
+            logger.debug("Recurring transaction %s: %d generated", schedule_id, count)
+        return created
 
-# Initialize scheduler
+@app.cli.command('generate-recurring')
+def generate_recurring_command():
+    """Generate due recurring transactions once and exit."""
+    created = RecurringTransactionService.generate_exclusively(catch_up=True)
+    if created is None:
+        print("Skipped: recurring transaction generation is already running elsewhere")
+        return
+    for schedule_id, count in sorted(created.items()):
+        print(f"recurring transaction {schedule_id}: {count} generated")
+    print(f"Generated {sum(created.values())} recurring transactions for {len(created)} schedules")
+
+@app.cli.command('rebuild-rollups')
+@click.option('--dry-run', is_flag=True, help='Only report differences, do not rebuild.')
+def rebuild_rollups_command(dry_run):
+    """Recompute monthly_category_totals and report differences."""
+    differences = RollupService.rebuild(dry_run=dry_run)
+    for row in differences:
+        print(row)
+    print(f"{len(differences)} rollup rows differed from transactions")
+
+# Initialize scheduler; web-only workers can set SCHEDULER_ENABLED=false.
+# CLI commands never start it, so migrations and rollup rebuilds don't race
+# the startup catch-up job.
 scheduler = APScheduler()
 app.config['SCHEDULER_API_ENABLED'] = True
 scheduler.init_app(app)
 
-# Schedule the recurring transaction job
-@scheduler.task('cron', id='generate_recurring_transactions', hour=0, minute=0)
-def scheduled_task():
-    with app.app_context():
-        try:
-            RecurringTransactionService.generate_pending_transactions()
-            print("Successfully generated recurring transactions")
-        except Exception as e:
-            print(f"Error generating recurring transactions: {e}")
-            db.session.rollback()
+if app.config['SCHEDULER_ENABLED'] and not RUNNING_CLI_COMMAND:
+    # Schedule the recurring transaction job
+    scheduler.add_job(
+        id='generate_recurring_transactions',
+        func=run_recurring_generation,
+        trigger='cron',
+        hour=0,
+        minute=0
+    )
 
-# Run once when server starts
-with app.app_context():
-    try:
-        RecurringTransactionService.generate_pending_transactions()
-        print("Initial generation of recurring transactions completed")
-    except Exception as e:
-        print(f"Error in initial generation of recurring transactions: {e}")
-        db.session.rollback()
-
-# Start the scheduler
-scheduler.start()
+    # Run once when server starts, in the background instead of at import time
+    if app.config['RECURRING_ON_STARTUP']:
+        scheduler.add_job(
+            id='generate_recurring_transactions_startup',
+            func=run_recurring_generation,
+            trigger='date'
+        )
+
+    # Start the scheduler
+    scheduler.start()
 
 if __name__ == '__main__':
     app.run(host='localhost', port=8000, debug=True)
@@ -0,0 +1,31 @@
+import logging
+import re
+
+# Credential values that must never reach the logs
+SENSITIVE_PATTERNS = [
+    (re.compile(r"(['\"]?(?:password|password_hash|token|secret)['\"]?\s*[:=]\s*)(['\"]?)[^'\",\s}]+\2", re.IGNORECASE),
+     r"\1\2[REDACTED]\2"),
+    (re.compile(r"(Bearer\s+)[A-Za-z0-9\-_.=]+"), r"\1[REDACTED]"),
+]
+
+class RedactingFilter(logging.Filter):
+    """Mask credentials in log records; only runs for records that are emitted"""
+    def filter(self, record):
+        message = record.getMessage()
+        redacted = message
+        for pattern, replacement in SENSITIVE_PATTERNS:
+            redacted = pattern.sub(replacement, redacted)
+        if redacted != message:
+            record.msg = redacted
+            record.args = None
+        return True
+
+def configure_logging(level='INFO'):
+    """Configure process-wide logging once, at application startup"""
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(name)s: %(message)s'))
+    handler.addFilter(RedactingFilter())
+
+    root = logging.getLogger()
+    root.handlers[:] = [handler]
+    root.setLevel(getattr(logging, str(level).upper(), logging.INFO))
@@ -0,0 +1,46 @@
+"""Cascade user deletes to owned rows
+
+Revision ID: 23f8bc3ff8b3
+Revises: 53fd25a90826
+Create Date: 2026-10-18 13:40:51.118904
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '23f8bc3ff8b3'
+down_revision = '53fd25a90826'
+branch_labels = None
+depends_on = None
+
+
+USER_OWNED_TABLES = ['transaction', 'recurring_transaction', 'budget']
+
+
+def _replace_user_fk(table, ondelete):
+    # Constraint names depend on how each table was first created, so drop
+    # whatever user_id -> user.id foreign keys actually exist
+    foreign_keys = [
+        fk for fk in sa.inspect(op.get_bind()).get_foreign_keys(table)
+        if fk['referred_table'] == 'user' and fk['constrained_columns'] == ['user_id']
+    ]
+    if not foreign_keys:
+        raise RuntimeError(f'No user_id foreign key found on "{table}"')
+
+    for fk in foreign_keys:
+        op.drop_constraint(fk['name'], table, type_='foreignkey')
+    op.create_foreign_key(
+        f'{table}_user_id_fkey', table, 'user', ['user_id'], ['id'], ondelete=ondelete
+    )
+
+
+def upgrade():
+    for table in USER_OWNED_TABLES:
+        _replace_user_fk(table, 'CASCADE')
+
+
+def downgrade():
+    for table in USER_OWNED_TABLES:
+        _replace_user_fk(table, None)
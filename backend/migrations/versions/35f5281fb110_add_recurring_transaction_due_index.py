@@ -0,0 +1,30 @@
+"""Add recurring transaction due index
+
+Revision ID: 35f5281fb110
+Revises: 6ac342e32634
+Create Date: 2026-10-18 10:03:27.551870
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '35f5281fb110'
+down_revision = '6ac342e32634'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('recurring_transaction', schema=None) as batch_op:
+        batch_op.create_index(
+            'ix_recurring_transaction_active_next_occurrence',
+            ['is_active', 'next_occurrence'],
+            unique=False
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('recurring_transaction', schema=None) as batch_op:
+        batch_op.drop_index('ix_recurring_transaction_active_next_occurrence')
@@ -0,0 +1,52 @@
+"""Add monthly category totals rollup
+
+Revision ID: 3a2ede9239ef
+Revises: 57df7ee3bab1
+Create Date: 2026-10-18 11:20:54.730162
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3a2ede9239ef'
+down_revision = '57df7ee3bab1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # A server started before this migration may have created the table with
+    # db.create_all(); it only holds derived totals, so rebuild it from scratch
+    if sa.inspect(op.get_bind()).has_table('monthly_category_totals'):
+        op.drop_table('monthly_category_totals')
+
+    op.create_table('monthly_category_totals',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('category_id', sa.Integer(), nullable=False),
+    sa.Column('year', sa.Integer(), nullable=False),
+    sa.Column('month', sa.Integer(), nullable=False),
+    sa.Column('total', sa.Float(), nullable=False),
+    sa.Column('transaction_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['category_id'], ['category.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'category_id', 'year', 'month')
+    )
+
+    # Backfill from existing transactions
+    op.execute("""
+        INSERT INTO monthly_category_totals (user_id, category_id, year, month, total, transaction_count)
+        SELECT user_id,
+               category_id,
+               EXTRACT(YEAR FROM created_at)::int,
+               EXTRACT(MONTH FROM created_at)::int,
+               SUM(amount),
+               COUNT(*)
+        FROM "transaction"
+        GROUP BY 1, 2, 3, 4
+    """)
+
+
+def downgrade():
+    op.drop_table('monthly_category_totals')
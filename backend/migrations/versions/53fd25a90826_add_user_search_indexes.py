@@ -0,0 +1,27 @@
+"""Add user search indexes
+
+Revision ID: 53fd25a90826
+Revises: 3a2ede9239ef
+Create Date: 2026-10-18 13:02:18.640257
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '53fd25a90826'
+down_revision = '3a2ede9239ef'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # text_pattern_ops lets LIKE 'prefix%' use the index under any collation
+    op.create_index('ix_user_email_lower', 'user', [sa.text('lower(email) text_pattern_ops')], unique=False)
+    op.create_index('ix_user_name_lower', 'user', [sa.text('lower(name) text_pattern_ops')], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_user_name_lower', table_name='user')
+    op.drop_index('ix_user_email_lower', table_name='user')
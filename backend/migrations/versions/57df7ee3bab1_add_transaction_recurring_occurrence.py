@@ -0,0 +1,41 @@
+"""Add transaction recurring occurrence key
+
+Revision ID: 57df7ee3bab1
+Revises: 35f5281fb110
+Create Date: 2026-10-18 10:41:09.316245
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '57df7ee3bab1'
+down_revision = '35f5281fb110'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('transaction', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('recurring_transaction_id', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('occurrence_date', sa.Date(), nullable=True))
+        batch_op.create_foreign_key(
+            'fk_transaction_recurring_transaction_id',
+            'recurring_transaction',
+            ['recurring_transaction_id'],
+            ['id'],
+            ondelete='SET NULL'
+        )
+        batch_op.create_unique_constraint(
+            'uq_transaction_recurring_occurrence',
+            ['recurring_transaction_id', 'occurrence_date']
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('transaction', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_transaction_recurring_occurrence', type_='unique')
+        batch_op.drop_constraint('fk_transaction_recurring_transaction_id', type_='foreignkey')
+        batch_op.drop_column('occurrence_date')
+        batch_op.drop_column('recurring_transaction_id')
@@ -0,0 +1,51 @@
+"""Add transaction and budget lookup indexes
+
+Revision ID: 6ac342e32634
+Revises: 98da502f60b1
+Create Date: 2026-10-18 09:12:41.208311
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6ac342e32634'
+down_revision = '98da502f60b1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # CONCURRENTLY builds don't block writes to the tables, but cannot run
+    # inside the migration transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_transaction_user_category_created_at',
+            'transaction',
+            ['user_id', 'category_id', 'created_at'],
+            unique=False,
+            postgresql_include=['amount'],
+            postgresql_concurrently=True
+        )
+        op.create_index(
+            'ix_transaction_user_created_at',
+            'transaction',
+            ['user_id', 'created_at'],
+            unique=False,
+            postgresql_concurrently=True
+        )
+        op.create_index(
+            'ix_budget_user_start_date',
+            'budget',
+            ['user_id', 'start_date'],
+            unique=False,
+            postgresql_concurrently=True
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_budget_user_start_date', table_name='budget', postgresql_concurrently=True)
+        op.drop_index('ix_transaction_user_created_at', table_name='transaction', postgresql_concurrently=True)
+        op.drop_index('ix_transaction_user_category_created_at', table_name='transaction', postgresql_concurrently=True)
@@ -0,0 +1,109 @@
+"""Store money as integer minor units
+
+Revision ID: 9b4e64160427
+Revises: 23f8bc3ff8b3
+Create Date: 2026-10-18 14:55:06.482913
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9b4e64160427'
+down_revision = '23f8bc3ff8b3'
+branch_labels = None
+depends_on = None
+
+
+MINOR_UNITS = 100
+MONEY_TABLES = ['transaction', 'recurring_transaction', 'budget']
+
+
+def _snapshot_totals(table, column):
+    """Per-user totals in minor units, plus the row count used as rounding tolerance"""
+    rows = op.get_bind().execute(sa.text(f"""
+        SELECT user_id, SUM({column}) AS total, COUNT(*) AS row_count
+        FROM "{table}"
+        GROUP BY user_id
+    """)).all()
+    return {row.user_id: (float(row.total or 0), row.row_count) for row in rows}
+
+
+def _check_totals(table, before, after):
+    """Abort the migration if any user's total moved by more than per-row rounding"""
+    mismatches = []
+    for user_id in set(before) | set(after):
+        before_total, row_count = before.get(user_id, (0.0, 0))
+        after_total, _ = after.get(user_id, (0.0, 0))
+        # Each row may round by at most half a minor unit
+        if abs(before_total * MINOR_UNITS - after_total) > 0.5 * row_count + 1e-6:
+            mismatches.append((user_id, before_total, after_total))
+    if mismatches:
+        raise RuntimeError(f'{table}: totals changed for {len(mismatches)} users, e.g. {mismatches[:5]}')
+    print(f'{table}: totals consistent for {len(after)} users')
+
+
+def _convert(table, from_column, to_column, to_type, expression):
+    op.add_column(table, sa.Column(to_column, to_type, nullable=True))
+    op.execute(f'UPDATE "{table}" SET {to_column} = {expression}')
+    op.alter_column(table, to_column, nullable=False)
+    op.drop_column(table, from_column)
+
+
+def upgrade():
+    # Dropping the float column also drops the index that INCLUDEs it
+    op.drop_index('ix_transaction_user_category_created_at', table_name='transaction')
+
+    for table in MONEY_TABLES:
+        before = _snapshot_totals(table, 'amount')
+        _convert(table, 'amount', 'amount_minor', sa.BigInteger(),
+                 f'ROUND(amount::numeric * {MINOR_UNITS})::bigint')
+        after = _snapshot_totals(table, 'amount_minor')
+        _check_totals(table, before, after)
+
+    op.create_index(
+        'ix_transaction_user_category_created_at',
+        'transaction',
+        ['user_id', 'category_id', 'created_at'],
+        unique=False,
+        postgresql_include=['amount_minor']
+    )
+
+    # Recompute the rollup from the converted rows so it matches them exactly
+    op.add_column('monthly_category_totals', sa.Column('total_minor', sa.BigInteger(), nullable=True))
+    op.execute('DELETE FROM monthly_category_totals')
+    op.execute("""
+        INSERT INTO monthly_category_totals (user_id, category_id, year, month, total, total_minor, transaction_count)
+        SELECT user_id,
+               category_id,
+               EXTRACT(YEAR FROM created_at)::int,
+               EXTRACT(MONTH FROM created_at)::int,
+               0,
+               SUM(amount_minor),
+               COUNT(*)
+        FROM "transaction"
+        GROUP BY 1, 2, 3, 4
+    """)
+    op.alter_column('monthly_category_totals', 'total_minor', nullable=False)
+    op.drop_column('monthly_category_totals', 'total')
+
+
+def downgrade():
+    op.add_column('monthly_category_totals', sa.Column('total', sa.Float(), nullable=True))
+    op.execute(f'UPDATE monthly_category_totals SET total = total_minor / {MINOR_UNITS}.0')
+    op.alter_column('monthly_category_totals', 'total', nullable=False)
+    op.drop_column('monthly_category_totals', 'total_minor')
+
+    op.drop_index('ix_transaction_user_category_created_at', table_name='transaction')
+
+    for table in MONEY_TABLES:
+        _convert(table, 'amount_minor', 'amount', sa.Float(), f'amount_minor / {MINOR_UNITS}.0')
+
+    op.create_index(
+        'ix_transaction_user_category_created_at',
+        'transaction',
+        ['user_id', 'category_id', 'created_at'],
+        unique=False,
+        postgresql_include=['amount']
+    )
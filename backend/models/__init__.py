@@ -1,9 +1,11 @@
 from flask_sqlalchemy import SQLAlchemy
+from services.replica_router import RoutingSession
 
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 
 # Import models after db is defined
-from .category import Category
-from .user import User
+from .category import Category, category_cache
+from .user import User, UserPrincipal
 from .transaction import Transaction, RecurringTransaction
-from .budget import Budget
\ No newline at end of file
+from .budget import Budget
+from .monthly_category_total import MonthlyCategoryTotal
\ No newline at end of file
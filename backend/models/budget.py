@@ -1,20 +1,39 @@
 from . import db
+from .category import category_cache
 from datetime import datetime
+from sqlalchemy.ext.hybrid import hybrid_property
+from .money import MINOR_UNITS, to_minor, from_minor
 
 class Budget(db.Model):
+    __table_args__ = (
+        db.Index('ix_budget_user_start_date', 'user_id', 'start_date'),
+    )
+
     id = db.Column(db.Integer, db.Sequence('budget_id_seq'), primary_key=True)
     start_date = db.Column(db.Date, nullable=False)
     end_date = db.Column(db.Date, nullable=False)
     description = db.Column(db.String(200), nullable=True)
-    amount = db.Column(db.Float, nullable=False)
+    amount_minor = db.Column(db.BigInteger, nullable=False)
     
     # Foreign Keys
-    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id', ondelete='CASCADE'), nullable=False)
     category_id = db.Column(db.Integer, db.ForeignKey('category.id'), nullable=False)
     
     # Relationships
     category = db.relationship('Category', backref='budgets')
     
+    @hybrid_property
+    def amount(self):
+        return from_minor(self.amount_minor)
+    
+    @amount.setter
+    def amount(self, value):
+        self.amount_minor = to_minor(value)
+    
+    @amount.expression
+    def amount(cls):
+        return cls.amount_minor / float(MINOR_UNITS)
+    
     def to_dict(self):
         return {
             'id': self.id,
@@ -23,5 +42,5 @@ class Budget(db.Model):
             'description': self.description,
             'amount': self.amount,
             'category_id': self.category_id,
-            'category': self.category.to_dict() if self.category else None
+            'category': category_cache.get(self.category_id)
         } 
\ No newline at end of file
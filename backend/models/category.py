@@ -1,4 +1,9 @@
 from . import db
+from flask import current_app
+import hashlib
+import json
+import threading
+import time
 
 class Category(db.Model):
     id = db.Column(db.Integer, db.Sequence('category_id_seq'), primary_key=True)
@@ -8,7 +13,7 @@ class Category(db.Model):
     updated_at = db.Column(db.DateTime, server_default=db.func.now(), onupdate=db.func.now())
 
     # Keep the relationship definition here
-    transactions = db.relationship('Transaction', back_populates='category') 
+    transactions = db.relationship('Transaction', back_populates='category')
     recurring_transactions = db.relationship('RecurringTransaction', back_populates='category')
     def to_dict(self):
         return {
@@ -17,4 +22,80 @@ class Category(db.Model):
             'icon': self.icon,
             'created_at': self.created_at.isoformat(),
             'updated_at': self.updated_at.isoformat()
-        } 
\ No newline at end of file
+        }
+
+class CategoryCache:
+    """
+    Read-mostly in-process cache of the whole category table.
+    Entries expire after CATEGORY_CACHE_TTL seconds so other workers pick up
+    admin writes; the writing worker invalidates immediately.
+    """
+    # Minimum seconds between reloads triggered by a cache miss
+    MISS_RELOAD_INTERVAL = 1
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._loaded_at = None
+        self._by_id = {}
+        self._listing = []
+        self._version = None
+
+    def _is_fresh(self):
+        if self._loaded_at is None:
+            return False
+        ttl = current_app.config.get('CATEGORY_CACHE_TTL', 60)
+        return time.monotonic() - self._loaded_at < ttl
+
+    def _load(self):
+        categories = Category.query.order_by(Category.name).all()
+        by_id = {category.id: category.to_dict() for category in categories}
+        listing = [{
+            'id': category.id,
+            'name': category.name,
+            'icon': category.icon
+        } for category in categories]
+
+        self._by_id = by_id
+        self._listing = listing
+        # Content hash, so every worker agrees on the version of the same data
+        self._version = hashlib.sha1(
+            json.dumps(listing, sort_keys=True, ensure_ascii=False).encode('utf-8')
+        ).hexdigest()
+        self._loaded_at = time.monotonic()
+
+    def _ensure_loaded(self):
+        if self._is_fresh():
+            return
+        with self._lock:
+            if not self._is_fresh():
+                self._load()
+
+    def invalidate(self):
+        with self._lock:
+            self._loaded_at = None
+
+    def version(self):
+        """Return the version (ETag) of the cached category listing"""
+        self._ensure_loaded()
+        return self._version
+
+    def listing(self):
+        """Return (version, categories ordered by name) for the categories endpoint"""
+        self._ensure_loaded()
+        return self._version, self._listing
+
+    def get(self, category_id):
+        """Return the to_dict() form of a category, or None if it does not exist"""
+        if category_id is None:
+            return None
+        self._ensure_loaded()
+        category = self._by_id.get(category_id)
+        if category is None:
+            # Another worker may have created it; reload at most once per interval
+            with self._lock:
+                if self._loaded_at is None or time.monotonic() - self._loaded_at >= self.MISS_RELOAD_INTERVAL:
+                    self._load()
+                category = self._by_id.get(category_id)
+        return dict(category) if category else None
+
+category_cache = CategoryCache()
@@ -0,0 +1,22 @@
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+
+# Money is stored as integer minor units (1/100 of the currency unit) and
+# converted to and from decimal amounts at the API boundary
+MINOR_UNITS = 100
+
+def to_minor(amount):
+    """Convert an API amount (number or numeric string) to integer minor units"""
+    try:
+        value = Decimal(str(amount))
+    except (InvalidOperation, TypeError, ValueError):
+        raise ValueError(f'Invalid amount: {amount!r}')
+    if not value.is_finite():
+        raise ValueError(f'Invalid amount: {amount!r}')
+    return int((value * MINOR_UNITS).quantize(Decimal('1'), rounding=ROUND_HALF_UP))
+
+def from_minor(amount_minor):
+    """Convert integer minor units to the float amount returned by the API"""
+    if amount_minor is None:
+        return None
+    # SUM() over BIGINT comes back as Decimal; keep the API returning numbers
+    return int(amount_minor) / MINOR_UNITS
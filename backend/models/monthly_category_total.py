@@ -0,0 +1,24 @@
+from . import db
+from .money import from_minor
+
+class MonthlyCategoryTotal(db.Model):
+    """Per-user, per-category spending rollup for one calendar month"""
+    __tablename__ = 'monthly_category_totals'
+
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id', ondelete='CASCADE'), primary_key=True)
+    category_id = db.Column(db.Integer, db.ForeignKey('category.id', ondelete='CASCADE'), primary_key=True)
+    year = db.Column(db.Integer, primary_key=True)
+    month = db.Column(db.Integer, primary_key=True)
+
+    total_minor = db.Column(db.BigInteger, nullable=False, default=0)
+    transaction_count = db.Column(db.Integer, nullable=False, default=0)
+
+    def to_dict(self):
+        return {
+            'user_id': self.user_id,
+            'category_id': self.category_id,
+            'year': self.year,
+            'month': self.month,
+            'total': from_minor(self.total_minor),
+            'transaction_count': self.transaction_count
+        }
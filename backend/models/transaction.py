@@ -1,19 +1,35 @@
-from datetime import datetime
+from datetime import datetime, timedelta
 from . import db
+from .category import category_cache
 from sqlalchemy.ext.declarative import declared_attr
+from sqlalchemy.ext.hybrid import hybrid_property
+from .money import MINOR_UNITS, to_minor, from_minor
+from . import recurrence
 
 class TransactionBase(db.Model):
     __abstract__ = True
     
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id', ondelete='CASCADE'), nullable=False)
     category_id = db.Column(db.Integer, db.ForeignKey('category.id'), nullable=False)
     
-    amount = db.Column(db.Float, nullable=False)
+    amount_minor = db.Column(db.BigInteger, nullable=False)
     description = db.Column(db.String(200))
     created_at = db.Column(db.DateTime, nullable=False)
     updated_at = db.Column(db.DateTime, server_default=db.func.now(), onupdate=db.func.now())
 
+    @hybrid_property
+    def amount(self):
+        return from_minor(self.amount_minor)
+
+    @amount.setter
+    def amount(self, value):
+        self.amount_minor = to_minor(value)
+    
+    @amount.expression
+    def amount(cls):
+        return cls.amount_minor / float(MINOR_UNITS)
+
 
     def to_dict(self):
         return {
@@ -28,6 +44,21 @@ class TransactionBase(db.Model):
 
 class Transaction(TransactionBase):
     __tablename__ = 'transaction'
+    __table_args__ = (
+        db.Index('ix_transaction_user_category_created_at', 'user_id', 'category_id', 'created_at',
+                 postgresql_include=['amount_minor']),
+        db.Index('ix_transaction_user_created_at', 'user_id', 'created_at'),
+        db.UniqueConstraint('recurring_transaction_id', 'occurrence_date',
+                            name='uq_transaction_recurring_occurrence'),
+    )
+    
+    # Set for rows generated from a schedule; makes generation idempotent
+    recurring_transaction_id = db.Column(
+        db.Integer,
+        db.ForeignKey('recurring_transaction.id', ondelete='SET NULL'),
+        nullable=True
+    )
+    occurrence_date = db.Column(db.Date, nullable=True)
     
     category = db.relationship('Category', back_populates='transactions')
     
@@ -36,11 +67,14 @@ class Transaction(TransactionBase):
     
     def to_dict(self):
         base_dict = super().to_dict()
-        base_dict['category'] = self.category.to_dict() if self.category else None
+        base_dict['category'] = category_cache.get(self.category_id)
         return base_dict
 
 class RecurringTransaction(TransactionBase):
     __tablename__ = 'recurring_transaction'
+    __table_args__ = (
+        db.Index('ix_recurring_transaction_active_next_occurrence', 'is_active', 'next_occurrence'),
+    )
     
     category = db.relationship('Category', back_populates='recurring_transactions')
     frequency = db.Column(db.String(50), nullable=False)  # 'daily', 'weekly', 'monthly', 'yearly'
@@ -57,7 +91,7 @@ class RecurringTransaction(TransactionBase):
             'last_generated': self.last_generated.isoformat() if self.last_generated else None,
             'next_occurrence': self.next_occurrence.isoformat() if self.next_occurrence else None,
             'is_active': self.is_active,
-            'category': self.category.to_dict() if self.category else None
+            'category': category_cache.get(self.category_id)
         })
         return base_dict
     
@@ -66,32 +100,27 @@ class RecurringTransaction(TransactionBase):
     
     @property
     def calculate_next_occurrence(self):
-        """Calculate the next occurrence date based on frequency"""
-        if not self.is_active or (self.end_date and self.end_date < datetime.now().date()):
-            return None
-            
-        last_date = self.last_generated or self.start_date
+        """Next occurrence on or after today that has not been generated yet"""
         today = datetime.now().date()
-        
-        if last_date >= today:
-            return last_date
+        if not self.is_active or (self.end_date and self.end_date < today):
+            return None
             
-        from dateutil.relativedelta import relativedelta
-        
-        frequency_map = {
-            'daily': lambda d: d + relativedelta(days=1),
-            'weekly': lambda d: d + relativedelta(weeks=1),
-            'monthly': lambda d: d + relativedelta(months=1),
-            'yearly': lambda d: d + relativedelta(years=1)
-        }
-        
-        if self.frequency not in frequency_map:
+        if self.frequency not in recurrence.FREQUENCIES:
             raise ValueError(f"Invalid frequency: {self.frequency}")
             
-        next_date = frequency_map[self.frequency](last_date)
+        # Occurrences are counted from the schedule's origin, as the generator does
+        origin = self.created_at.date()
+        start = today
+        if self.last_generated:
+            last_generated = self.last_generated
+            if isinstance(last_generated, datetime):
+                last_generated = last_generated.date()
+            start = max(start, last_generated + timedelta(days=1))
+        index = recurrence.first_index_on_or_after(origin, self.frequency, start)
+        next_date = recurrence.occurrence(origin, self.frequency, index)
         
         # If next_date is past end_date, return None
         if self.end_date and next_date > self.end_date:
             return None
             
-        return next_date 
\ No newline at end of file
+        return next_date
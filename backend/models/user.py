@@ -1,8 +1,15 @@
 from . import db
 from flask_login import UserMixin
-from werkzeug.security import generate_password_hash, check_password_hash
+from services.password_service import PasswordService
+from collections import namedtuple
 
 class User(db.Model, UserMixin):
+    __table_args__ = (
+        # Back the admin prefix search on email and name
+        db.Index('ix_user_email_lower', db.text('lower(email) text_pattern_ops')),
+        db.Index('ix_user_name_lower', db.text('lower(name) text_pattern_ops')),
+    )
+
     id = db.Column(db.Integer, db.Sequence('user_id_seq'), primary_key=True)
     email = db.Column(db.String(100), unique=True)
     name = db.Column(db.String(100))
@@ -10,19 +17,22 @@ class User(db.Model, UserMixin):
     is_admin = db.Column(db.Boolean, default=False)
     
     # Link transactions to user
-    transactions = db.relationship('Transaction', backref='user', lazy=True) 
+    transactions = db.relationship('Transaction', backref='user', lazy=True, passive_deletes=True) 
     
     # Add this line
-    budgets = db.relationship('Budget', backref='user', lazy=True)
+    budgets = db.relationship('Budget', backref='user', lazy=True, passive_deletes=True)
     
     # Add this relationship
-    recurring_transactions = db.relationship('RecurringTransaction', backref='user', lazy=True)
+    recurring_transactions = db.relationship('RecurringTransaction', backref='user', lazy=True, passive_deletes=True)
     
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password, method='pbkdf2:sha256')
+        self.password_hash = PasswordService.hash_password(password)
         
     def check_password(self, password):
-        return check_password_hash(self.password_hash, password)
+        return PasswordService.verify_password(self.password_hash, password)
+    
+    def password_needs_rehash(self):
+        return PasswordService.needs_rehash(self.password_hash)
     
     def to_dict(self):
         return {
@@ -31,4 +41,12 @@ class User(db.Model, UserMixin):
             'is_admin': self.is_admin,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'name': self.name
-        }
\ No newline at end of file
+        }
+
+class UserPrincipal(namedtuple('UserPrincipal', ['id', 'is_admin', 'name', 'email'])):
+    """Immutable snapshot of the authenticated user passed to route handlers"""
+    __slots__ = ()
+
+    @classmethod
+    def from_user(cls, user):
+        return cls(user.id, bool(user.is_admin), user.name, user.email)
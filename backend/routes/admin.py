@@ -1,31 +1,88 @@
-from flask import Blueprint, jsonify
+from flask import Blueprint, jsonify, request
 from models.user import User
-from models.category import Category
-from models.transaction import Transaction
+from models.monthly_category_total import MonthlyCategoryTotal
 from models import db
+from services.ttl_cache import TTLCache
+from services.db_pool import pool_metrics
+from routes.auth import token_required, is_admin
+from config import Config
+from sqlalchemy import select, func, literal_column
+from services.replica_router import read_only
 
 admin_bp = Blueprint('admin', __name__)
 
+# Dashboard stats are shared by all admins and refreshed at most every TTL seconds
+stats_cache = TTLCache(maxsize=2, ttl=Config.ADMIN_STATS_TTL)
+
+def reltuples(table_name):
+    """Planner row estimate for a table, read from pg_class"""
+    return literal_column(
+        f"(SELECT GREATEST(reltuples, 0)::bigint FROM pg_class WHERE oid = '{table_name}'::regclass)"
+    )
+
+def compute_admin_stats(estimated=False):
+    """Compute all dashboard counters in a single statement"""
+    # Categories with transactions and the transaction count come from the
+    # monthly rollup, which is far smaller than the transaction table
+    active_categories = select(
+        func.count(func.distinct(MonthlyCategoryTotal.category_id))
+    ).where(
+        MonthlyCategoryTotal.transaction_count > 0
+    ).scalar_subquery()
+
+    if estimated:
+        total_users = reltuples('"user"')
+        total_transactions = reltuples('"transaction"')
+    else:
+        total_users = select(func.count(User.id)).scalar_subquery()
+        total_transactions = select(
+            func.coalesce(func.sum(MonthlyCategoryTotal.transaction_count), 0)
+        ).scalar_subquery()
+
+    row = db.session.execute(select(
+        total_users.label('total_users'),
+        active_categories.label('active_categories'),
+        total_transactions.label('total_transactions')
+    )).one()
+
+    return {
+        'totalUsers': int(row.total_users or 0),
+        'activeCategories': int(row.active_categories or 0),
+        'totalTransactions': int(row.total_transactions or 0)
+    }
+
 @admin_bp.route('/stats', methods=['GET'])
+@read_only
 def get_admin_stats():
     try:
-        # Get total users
-        total_users = db.session.query(User).count()
-
-        # Get active categories (categories that have transactions)
-        active_categories = db.session.query(Category)\
-            .join(Transaction)\
-            .distinct(Category.id)\
-            .count()
-
-        # Get total transactions
-        total_transactions = db.session.query(Transaction).count()
-
-        return jsonify({
-            'totalUsers': total_users,
-            'activeCategories': active_categories,
-            'totalTransactions': total_transactions
-        }), 200
+        estimated = request.args.get('estimate', type=int) == 1
+        cache_key = 'estimated' if estimated else 'exact'
+
+        stats = stats_cache.get(cache_key)
+        if stats is None:
+            stats = compute_admin_stats(estimated=estimated)
+            stats_cache.set(cache_key, stats)
+
+        return jsonify(stats), 200
     except Exception as e:
         print(f"Error getting admin stats: {str(e)}")
-        return jsonify({'error': 'Internal server error'}), 500 
\ No newline at end of file
+        return jsonify({'error': 'Internal server error'}), 500
+
+@admin_bp.route('/db-pool', methods=['GET'])
+@token_required
+@is_admin
+def get_db_pool_stats(current_user):
+    """Connection pool occupancy and checkout wait times for this worker"""
+    pool = db.engine.pool
+    stats = pool_metrics.snapshot()
+    stats.update({
+        'pool_class': type(pool).__name__,
+        'status': pool.status()
+    })
+    if hasattr(pool, 'checkedout'):
+        stats.update({
+            'size': pool.size(),
+            'checked_out': pool.checkedout(),
+            'overflow': pool.overflow()
+        })
+    return jsonify(stats), 200
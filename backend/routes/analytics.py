@@ -0,0 +1,45 @@
+from flask import Blueprint, jsonify, request
+from routes.auth import token_required
+from services.analytics_service import AnalyticsService, BUCKET_SPANS, MAX_BUCKETS
+from datetime import datetime, timedelta
+from services.replica_router import read_only
+
+analytics_bp = Blueprint('analytics', __name__)
+
+@analytics_bp.route('/spending', methods=['GET'])
+@token_required
+@read_only
+def get_spending(current_user):
+    bucket = request.args.get('bucket', 'day')
+    top_n = request.args.get('top_n', type=int)
+    category_ids = request.args.getlist('category_id', type=int)
+    
+    if bucket not in BUCKET_SPANS:
+        return jsonify({'error': f"bucket must be one of {', '.join(BUCKET_SPANS)}"}), 400
+    
+    # Default to the last 30 days; end_date is exclusive
+    try:
+        end_date = datetime.fromisoformat(request.args['end_date']) if 'end_date' in request.args \
+            else datetime.combine(datetime.now().date() + timedelta(days=1), datetime.min.time())
+        start_date = datetime.fromisoformat(request.args['start_date']) if 'start_date' in request.args \
+            else end_date - timedelta(days=30)
+    except ValueError:
+        return jsonify({'error': 'Invalid date format'}), 400
+    
+    if start_date >= end_date:
+        return jsonify({'error': 'start_date must be before end_date'}), 400
+    
+    if AnalyticsService.bucket_count(start_date, end_date, bucket) > MAX_BUCKETS:
+        return jsonify({'error': f'Date range spans more than {MAX_BUCKETS} {bucket} buckets'}), 400
+    
+    if top_n is not None and top_n <= 0:
+        return jsonify({'error': 'top_n must be positive'}), 400
+    
+    return jsonify(AnalyticsService.spending_series(
+        current_user.id,
+        start_date,
+        end_date,
+        bucket=bucket,
+        category_ids=category_ids or None,
+        top_n=top_n
+    ))
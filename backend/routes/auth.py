@@ -1,6 +1,9 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, current_app
 from models import db
-from models.user import User
+from models.user import User, UserPrincipal
+from services.ttl_cache import TTLCache
+from services.password_service import PasswordHasherBusy
+from config import Config
 from flask_login import login_required, current_user, logout_user
 import jwt as pyjwt
 from datetime import datetime, timedelta
@@ -9,26 +12,48 @@ import logging
 
 auth = Blueprint('auth', __name__)
 
-# Set up logging at the top of the file
-logging.basicConfig(level=logging.DEBUG)
+# Logging is configured once in app.py
 logger = logging.getLogger(__name__)
 
 # Add your JWT secret key (move this to environment variables in production)
 JWT_SECRET = 'your-secret-key'
 JWT_EXPIRATION = 24  # hours
 
-def create_token(user_id, is_admin):
+# Methods for which signed token claims may be trusted without a lookup
+READ_ONLY_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+# Authenticated users keyed by id; evicted by routes/users.py on writes
+user_cache = TTLCache(maxsize=Config.USER_CACHE_SIZE, ttl=Config.USER_CACHE_TTL)
+
+def create_token(user):
     """Create a new JWT token"""
     return pyjwt.encode(
         {
-            'user_id': str(user_id),
-            'is_admin': is_admin,
+            'user_id': str(user.id),
+            'is_admin': user.is_admin,
+            'name': user.name,
+            'email': user.email,
             'exp': datetime.utcnow() + timedelta(hours=JWT_EXPIRATION)
         },
         JWT_SECRET,
         algorithm='HS256'
     )
 
+def get_principal(user_id, claims):
+    """Resolve the principal for a token, hitting the database only on a cache miss"""
+    if current_app.config.get('TRUST_TOKEN_CLAIMS') and request.method in READ_ONLY_METHODS \
+            and 'email' in claims:
+        return UserPrincipal(user_id, bool(claims.get('is_admin')), claims.get('name'), claims['email'])
+    
+    principal = user_cache.get(user_id)
+    if principal is None:
+        user = User.query.get(user_id)
+        if not user:
+            return None
+        principal = UserPrincipal.from_user(user)
+        user_cache.set(user_id, principal)
+    return principal
+
 def token_required(f):
     @wraps(f)
     def decorated(*args, **kwargs):
@@ -43,10 +68,14 @@ def token_required(f):
         
         try:
             data = pyjwt.decode(token, JWT_SECRET, algorithms=['HS256'])
-            current_user = User.query.get(data['user_id'])
+            user_id = int(data['user_id'])
         except:
             return jsonify({'error': 'Token is invalid'}), 401
-            
+        
+        current_user = get_principal(user_id, data)
+        if not current_user:
+            return jsonify({'error': 'Token is invalid'}), 401
+        
         return f(current_user, *args, **kwargs)
     
     return decorated
@@ -69,20 +98,28 @@ def login():
     try:
         logger.debug("Login attempt received")
         data = request.json
-        logger.debug(f"Request data: {data}")
         
         email = data.get('email')
         password = data.get('password')
 
         if not email or not password:
-            logger.error("Missing email or password")
+            logger.warning("Missing email or password")
             return jsonify({'error': 'Email and password are required'}), 400
 
         user = User.query.filter_by(email=email).first()
-        logger.debug(f"User found: {user is not None}")
+        logger.debug("User found: %s", user is not None)
+        # Hashing may queue for seconds; don't hold a pooled connection meanwhile
+        db.session.close()
         
         if user and user.check_password(password):
-            token = create_token(user.id, user.is_admin)
+            # Upgrade hashes made with older parameters while we have the password
+            if user.password_needs_rehash():
+                user.set_password(password)
+                db.session.add(user)
+                db.session.commit()
+            
+            token = create_token(user)
+            user_cache.set(user.id, UserPrincipal.from_user(user))
             logger.debug("Login successful, token created")
             return jsonify({
                 'id': str(user.id),
@@ -93,9 +130,11 @@ def login():
                 'status': 'success'
             })
         
-        logger.error("Invalid credentials")
+        logger.info("Invalid credentials")
         return jsonify({'error': 'Invalid credentials'}), 401
 
+    except PasswordHasherBusy:
+        return jsonify({'error': 'Server busy, please retry'}), 503
     except Exception as e:
         logger.exception("Error during login")  # This will log the full stack trace
         return jsonify({'error': str(e)}), 500
@@ -113,6 +152,8 @@ def register():
 
         if User.query.filter_by(email=email).first():
             return jsonify({'error': 'Email already registered'}), 400
+        # Release the connection while the password is hashed
+        db.session.close()
 
         user = User(
             email=email,
@@ -131,6 +172,8 @@ def register():
             'status': 'success'
         })
 
+    except PasswordHasherBusy:
+        return jsonify({'error': 'Server busy, please retry'}), 503
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -1,12 +1,17 @@
 from flask import Blueprint, request, jsonify
 from flask_login import login_required, current_user
 from routes.auth import token_required
-from models import db, Budget, Transaction
-from sqlalchemy import func, extract
+from models import db, Budget
+from models.money import from_minor
 from datetime import datetime
+from services.budget_service import BudgetService
+from services.replica_router import read_only
 
 budgets = Blueprint('budgets', __name__)
 
+# Upper bound on checks answered by one batched /budgets/check call
+MAX_BUDGET_CHECKS = 200
+
 @budgets.route('', methods=['POST'])
 @token_required
 def create_budget(current_user):
@@ -26,6 +31,7 @@ def create_budget(current_user):
     
     db.session.add(new_budget)
     db.session.commit()
+    BudgetService.invalidate_forecast(current_user.id)
     
     return jsonify(new_budget.to_dict()), 201
 
@@ -48,50 +54,38 @@ def update_budget(current_user, id):
         budget.category_id = data['category_id']
         
     db.session.commit()
+    BudgetService.invalidate_forecast(current_user.id)
     
     return jsonify(budget.to_dict()) 
 
 @budgets.route('', methods=['GET'])
 @token_required
+@read_only
 def get_budgets(current_user):
     # Get month and year from query parameters, default to current month/year
     month = request.args.get('month', datetime.now().month, type=int)
     year = request.args.get('year', datetime.now().year, type=int)
 
-    # Calculate start and end dates for the month
-    start_date = datetime(year, month, 1)
-    if month == 12:
-        end_date = datetime(year + 1, 1, 1)
-    else:
-        end_date = datetime(year, month + 1, 1)
-
-    # Query budgets that were created specifically for this month/year
-    budgets = Budget.query.filter(
-        Budget.user_id == current_user.id,
-        extract('month', Budget.start_date) == month,
-        extract('year', Budget.start_date) == year
-    ).all()
+    # Load budgets together with their spending in one grouped query
+    budget_progress = BudgetService.get_budget_progress(current_user.id, year, month)
     
     budget_data = []
-    for budget in budgets:
-        # Calculate total transactions for this budget's category and date range
-        total_transactions = db.session.query(
-            func.sum(Transaction.amount)
-        ).filter(
-            Transaction.category_id == budget.category_id,
-            Transaction.user_id == current_user.id,
-            Transaction.created_at >= start_date,
-            Transaction.created_at < end_date
-        ).scalar() or 0
-        
+    for budget, spent_minor in budget_progress:
         # Convert budget to dict and add transaction total
         budget_dict = budget.to_dict()
-        budget_dict['total_transactions'] = float(total_transactions)
-        budget_dict['remaining_amount'] = float(budget.amount - total_transactions)
+        budget_dict['total_transactions'] = from_minor(spent_minor)
+        budget_dict['remaining_amount'] = from_minor(budget.amount_minor - spent_minor)
         budget_data.append(budget_dict)
     
     return jsonify(budget_data) 
 
+@budgets.route('/forecast', methods=['GET'])
+@token_required
+@read_only
+def get_budget_forecast(current_user):
+    """Project this month's budgets to month end from spending pace and recurring charges"""
+    return jsonify(BudgetService.forecast(current_user.id))
+
 @budgets.route('/<int:budget_id>', methods=['DELETE'])
 @token_required
 def delete_budget(current_user, budget_id):
@@ -102,6 +96,7 @@ def delete_budget(current_user, budget_id):
         
     db.session.delete(budget)
     db.session.commit()
+    BudgetService.invalidate_forecast(current_user.id)
     
     return jsonify({'message': 'Budget deleted successfully'}), 200 
 
@@ -110,6 +105,21 @@ def delete_budget(current_user, budget_id):
 def check_budget(current_user):
     data = request.get_json()
     
+    # Batched variant: {"checks": [{"category_id": ..., "date": ...}, ...]}
+    if 'checks' in data:
+        checks = data['checks']
+        if not isinstance(checks, list) or len(checks) > MAX_BUDGET_CHECKS:
+            return jsonify({'error': f'checks must be a list of at most {MAX_BUDGET_CHECKS} items'}), 400
+        try:
+            pairs = [
+                (int(check['category_id']), datetime.strptime(check['date'], '%Y-%m-%d'))
+                for check in checks
+            ]
+        except (KeyError, TypeError, ValueError):
+            return jsonify({'error': 'Each check requires category_id and date (YYYY-MM-DD)'}), 400
+        
+        return jsonify(BudgetService.check_budgets(current_user.id, pairs))
+    
     # Validate required fields
     if not all(key in data for key in ['category_id', 'date']):
         return jsonify({'error': 'Missing required fields'}), 400
@@ -119,38 +129,14 @@ def check_budget(current_user):
     month = date.month
     year = date.year
     
-    # Calculate start and end dates for the month
-    start_date = datetime(year, month, 1)
-    if month == 12:
-        end_date = datetime(year + 1, 1, 1)
-    else:
-        end_date = datetime(year, month + 1, 1)
-    
-    # Get the budget for this category and month
-    budget = Budget.query.filter(
-        Budget.user_id == current_user.id,
-        Budget.category_id == data['category_id'],
-        extract('month', Budget.start_date) == month,
-        extract('year', Budget.start_date) == year
-    ).first()
+    # Get the budget for this category and month together with its spending
+    budget_progress = BudgetService.get_budget_progress(
+        current_user.id, year, month, category_id=data['category_id']
+    )
     
-    if not budget:
+    if not budget_progress:
         return jsonify({'has_budget': False})
     
-    # Calculate total transactions for this budget's category and date range
-    total_transactions = db.session.query(
-        func.sum(Transaction.amount)
-    ).filter(
-        Transaction.category_id == data['category_id'],
-        Transaction.user_id == current_user.id,
-        Transaction.created_at >= start_date,
-        Transaction.created_at < end_date
-    ).scalar() or 0
-    
-    return jsonify({
-        'has_budget': True,
-        'budget_amount': float(budget.amount),
-        'total_transactions': float(total_transactions),
-        'remaining_amount': float(budget.amount - total_transactions),
-        'is_exceeded': total_transactions >= budget.amount
-    }) 
+    budget, spent_minor = budget_progress[0]
+    
+    return jsonify(BudgetService.check_result(budget, spent_minor))
@@ -1,19 +1,25 @@
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, jsonify, request, Response
 from routes.auth import token_required, is_admin
-from models import Category, db
+from models import Category, category_cache, db
+from services.replica_router import read_only
 
 categories_bp = Blueprint('categories', __name__)
 
 @categories_bp.route('', methods=['GET'])
 @token_required
+@read_only
 def get_categories(current_user):
     try:
-        categories = Category.query.order_by(Category.name).all()
-        return jsonify([{
-            'id': category.id,
-            'name': category.name,
-            'icon': category.icon
-        } for category in categories])
+        version, categories = category_cache.listing()
+        
+        # Let polling clients skip the payload when nothing changed
+        if request.if_none_match.contains(version):
+            response = Response(status=304)
+        else:
+            response = jsonify(categories)
+        response.set_etag(version)
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
     except Exception as e:
         return jsonify({'error': str(e)}), 500 
 
@@ -29,6 +35,7 @@ def create_category(current_user):
         )
         db.session.add(new_category)
         db.session.commit()
+        category_cache.invalidate()
         
         return jsonify({
             'id': new_category.id,
@@ -53,6 +60,7 @@ def update_category(current_user, category_id):
             category.icon = data['icon']
             
         db.session.commit()
+        category_cache.invalidate()
         
         return jsonify({
             'id': category.id,
@@ -71,6 +79,7 @@ def delete_category(current_user, category_id):
         category = Category.query.get_or_404(category_id)
         db.session.delete(category)
         db.session.commit()
+        category_cache.invalidate()
         
         return jsonify({'message': 'Category deleted successfully'}), 200
     except Exception as e:
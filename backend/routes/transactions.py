@@ -1,24 +1,42 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, json, Response, stream_with_context
+from models import category_cache
+from models.money import from_minor
 from services.recurring_transaction_service import RecurringTransactionService
+from services.pagination_service import PaginationService
+from services.rollup_service import RollupService
+from services.budget_service import BudgetService
+from services.transaction_batch_service import TransactionBatchService, MAX_BATCH_OPERATIONS
+from services.import_service import ImportService, DEFAULT_IMPORT_BATCH_SIZE, MAX_IMPORT_BATCH_SIZE
 from routes.auth import token_required
 from models.transaction import Transaction, RecurringTransaction
 from models import db
-from datetime import datetime
+from sqlalchemy.exc import IntegrityError
+from datetime import datetime, timedelta
+import io
+import csv
+import zlib
+from services.replica_router import read_only
 
 transactions = Blueprint('transactions', __name__)
 
-@transactions.route('', methods=['GET'])
-@token_required
-def get_transactions(current_user):
-    # Get query parameters
-    category_id = request.args.get('category_id', type=int)
-    start_date = request.args.get('start_date')
-    end_date = request.args.get('end_date')
-    month = request.args.get('month', type=int)
-    year = request.args.get('year', type=int)
-    limit = request.args.get('limit', type=int)
+# Number of rows fetched per round trip when streaming responses
+STREAM_BATCH_SIZE = 500
+
+EXPORT_COLUMNS = ['id', 'date', 'amount', 'description', 'category_id', 'category']
+
+# Longest windows served by the recurring calendar endpoints
+MAX_UPCOMING_DAYS = 366
+MAX_PROJECTION_MONTHS = 24
+
+def build_transaction_query(current_user, args):
+    """Build the filtered transaction query shared by the list endpoints"""
+    category_id = args.get('category_id', type=int)
+    start_date = args.get('start_date')
+    end_date = args.get('end_date')
+    month = args.get('month', type=int)
+    year = args.get('year', type=int)
     
-    # Build the base query
+    # Build the base query; categories are served from category_cache
     query = Transaction.query.filter_by(user_id=current_user.id)
     
     # Add category filter if provided
@@ -39,16 +57,152 @@ def get_transactions(current_user):
         query = query.filter(Transaction.created_at >= start)
         query = query.filter(Transaction.created_at < end)
     
+    return query
+
+def stream_transactions(query):
+    """Stream the query as a JSON array, reading rows from a server-side cursor"""
+    def generate():
+        yield '['
+        first = True
+        for transaction in query.yield_per(STREAM_BATCH_SIZE):
+            if not first:
+                yield ','
+            first = False
+            yield json.dumps(transaction.to_dict())
+        yield ']'
+    
+    return Response(stream_with_context(generate()), mimetype='application/json')
+
+@transactions.route('', methods=['GET'])
+@token_required
+@read_only
+def get_transactions(current_user):
+    # Get query parameters
+    limit = request.args.get('limit', type=int)
+    cursor = request.args.get('cursor')
+    page_size = request.args.get('page_size', type=int)
+    stream = request.args.get('stream', type=int)
+    
+    query = build_transaction_query(current_user, request.args)
+    
+    # Keyset pagination on (created_at, id) when a cursor or page size is given
+    if cursor is not None or page_size is not None:
+        try:
+            cursor_values = PaginationService.decode_cursor(cursor, 2) if cursor else None
+            if cursor_values:
+                cursor_values = [datetime.fromisoformat(cursor_values[0]), int(cursor_values[1])]
+        except (ValueError, TypeError):
+            return jsonify({'error': 'Invalid cursor'}), 400
+        
+        rows, last_row = PaginationService.paginate(
+            query,
+            [Transaction.created_at, Transaction.id],
+            cursor_values,
+            PaginationService.clamp_page_size(page_size)
+        )
+        return jsonify({
+            'transactions': [transaction.to_dict() for transaction in rows],
+            'next_cursor': PaginationService.encode_cursor(last_row.created_at, last_row.id) if last_row else None
+        })
+    
     # Execute query with ordering
-    query = query.order_by(Transaction.created_at.desc())
+    query = query.order_by(Transaction.created_at.desc(), Transaction.id.desc())
     
     # Apply limit if provided
     if limit is not None:
         query = query.limit(limit)
     
+    if stream:
+        return stream_transactions(query)
+    
     transactions = query.all()
     return jsonify([transaction.to_dict() for transaction in transactions])
 
+@transactions.route('/export', methods=['GET'])
+@token_required
+@read_only
+def export_transactions(current_user):
+    """Stream the user's transactions as CSV or NDJSON, optionally gzip-encoded"""
+    file_format = request.args.get('format', 'csv')
+    use_gzip = request.args.get('gzip', type=int)
+    
+    if file_format not in ('csv', 'ndjson'):
+        return jsonify({'error': 'format must be csv or ndjson'}), 400
+    
+    query = build_transaction_query(current_user, request.args).with_entities(
+        Transaction.id,
+        Transaction.created_at,
+        Transaction.amount_minor,
+        Transaction.description,
+        Transaction.category_id
+    ).order_by(Transaction.created_at, Transaction.id)
+    
+    _, categories = category_cache.listing()
+    category_names = {category['id']: category['name'] for category in categories}
+    
+    def format_chunk(rows, include_header):
+        buffer = io.StringIO()
+        if file_format == 'csv':
+            writer = csv.writer(buffer)
+            if include_header:
+                writer.writerow(EXPORT_COLUMNS)
+            for row in rows:
+                writer.writerow([
+                    row.id,
+                    row.created_at.isoformat(),
+                    from_minor(row.amount_minor),
+                    row.description,
+                    row.category_id,
+                    category_names.get(row.category_id)
+                ])
+        else:
+            for row in rows:
+                buffer.write(json.dumps({
+                    'id': row.id,
+                    'date': row.created_at.isoformat(),
+                    'amount': from_minor(row.amount_minor),
+                    'description': row.description,
+                    'category_id': row.category_id,
+                    'category': category_names.get(row.category_id)
+                }))
+                buffer.write('\n')
+        return buffer.getvalue().encode('utf-8')
+    
+    def generate():
+        compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS) if use_gzip else None
+        
+        def emit(data):
+            return compressor.compress(data) if compressor else data
+        
+        # Send the header right away so the first byte does not wait on the query
+        chunk = emit(format_chunk([], include_header=True))
+        if chunk:
+            yield chunk
+        
+        rows = []
+        for row in query.yield_per(STREAM_BATCH_SIZE):
+            rows.append(row)
+            if len(rows) >= STREAM_BATCH_SIZE:
+                chunk = emit(format_chunk(rows, include_header=False))
+                rows = []
+                if chunk:
+                    yield chunk
+        
+        if rows:
+            yield emit(format_chunk(rows, include_header=False))
+        if compressor:
+            yield compressor.flush()
+    
+    extension = 'csv' if file_format == 'csv' else 'ndjson'
+    response = Response(
+        stream_with_context(generate()),
+        mimetype='text/csv' if file_format == 'csv' else 'application/x-ndjson'
+    )
+    response.headers['Content-Disposition'] = f'attachment; filename=transactions.{extension}'
+    if use_gzip:
+        response.headers['Content-Encoding'] = 'gzip'
+    return response
+
 @transactions.route('', methods=['POST'])
 @token_required
 def create_transaction(current_user):
@@ -64,6 +218,7 @@ def create_transaction(current_user):
     )
     
     db.session.add(new_transaction)
+    RollupService.record_transaction(new_transaction)
     
     # If recurring, create a recurring transaction record
     if data.get('isRecurring', False):
@@ -85,6 +240,7 @@ def create_transaction(current_user):
         db.session.add(recurring_transaction)
     
     db.session.commit()
+    BudgetService.invalidate_forecast(current_user.id)
     
     response_data = new_transaction.to_dict()
     if data.get('isRecurring', False):
@@ -92,6 +248,102 @@ def create_transaction(current_user):
     
     return jsonify(response_data), 201
 
+@transactions.route('/import', methods=['POST'])
+@token_required
+def import_transactions(current_user):
+    """Import a CSV (header: date,amount,description,category) or JSON-lines upload"""
+    batch_size = request.args.get('batch_size', DEFAULT_IMPORT_BATCH_SIZE, type=int)
+    if batch_size <= 0 or batch_size > MAX_IMPORT_BATCH_SIZE:
+        return jsonify({'error': f'batch_size must be between 1 and {MAX_IMPORT_BATCH_SIZE}'}), 400
+    
+    # Accept either a multipart file field or a raw request body
+    upload = request.files.get('file')
+    if upload:
+        raw = upload.stream
+        name = (upload.filename or '').lower()
+        content_type = upload.mimetype or ''
+    else:
+        raw = request.stream
+        name = ''
+        content_type = request.mimetype or ''
+    
+    file_format = request.args.get('format')
+    if not file_format:
+        file_format = 'csv' if 'csv' in content_type or name.endswith('.csv') else 'ndjson'
+    if file_format not in ('csv', 'ndjson'):
+        return jsonify({'error': 'format must be csv or ndjson'}), 400
+    
+    stream = io.TextIOWrapper(raw, encoding='utf-8-sig', newline='')
+    rows = ImportService.read_csv(stream) if file_format == 'csv' else ImportService.read_ndjson(stream)
+    
+    try:
+        result = ImportService.import_transactions(current_user.id, rows, batch_size=batch_size)
+    except (UnicodeDecodeError, csv.Error) as e:
+        db.session.rollback()
+        # Batches before the error are already committed
+        BudgetService.invalidate_forecast(current_user.id)
+        return jsonify({'error': f'Could not parse upload: {e}'}), 400
+    
+    BudgetService.invalidate_forecast(current_user.id)
+    return jsonify(result), 201 if result['imported'] else 200
+
+@transactions.route('/batch', methods=['POST'])
+@token_required
+def batch_transactions(current_user):
+    """Apply a list of create/update/delete operations in one database transaction"""
+    data = request.get_json()
+    operations = data.get('operations') if isinstance(data, dict) else None
+    
+    if not isinstance(operations, list) or not operations:
+        return jsonify({'error': 'operations must be a non-empty list'}), 400
+    if len(operations) > MAX_BATCH_OPERATIONS:
+        return jsonify({'error': f'At most {MAX_BATCH_OPERATIONS} operations per batch'}), 400
+    
+    try:
+        ok, results = TransactionBatchService.apply(current_user.id, operations)
+    except IntegrityError:
+        db.session.rollback()
+        return jsonify({'error': 'Batch references an unknown category'}), 400
+    
+    if not ok:
+        db.session.rollback()
+        return jsonify({'applied': False, 'results': results}), 400
+    
+    BudgetService.invalidate_forecast(current_user.id)
+    return jsonify({'applied': True, 'results': results})
+
+@transactions.route('/recurring/upcoming', methods=['GET'])
+@token_required
+@read_only
+def get_upcoming_recurring(current_user):
+    """List recurring occurrences due in the next `days` days (default 30)"""
+    days = request.args.get('days', 30, type=int)
+    limit = request.args.get('limit', type=int)
+    if days <= 0 or days > MAX_UPCOMING_DAYS:
+        return jsonify({'error': f'days must be between 1 and {MAX_UPCOMING_DAYS}'}), 400
+    if limit is not None and limit <= 0:
+        return jsonify({'error': 'limit must be positive'}), 400
+    
+    start_date = datetime.now().date()
+    end_date = start_date + timedelta(days=days)
+    return jsonify({
+        'start_date': start_date.isoformat(),
+        'end_date': end_date.isoformat(),
+        'occurrences': RecurringTransactionService.upcoming(current_user.id, start_date, end_date, limit)
+    })
+
+@transactions.route('/recurring/projection', methods=['GET'])
+@token_required
+@read_only
+def get_recurring_projection(current_user):
+    """Project recurring spend per month for the next `months` months (default 12)"""
+    months = request.args.get('months', 12, type=int)
+    if months <= 0 or months > MAX_PROJECTION_MONTHS:
+        return jsonify({'error': f'months must be between 1 and {MAX_PROJECTION_MONTHS}'}), 400
+    
+    start_date = datetime.now().date()
+    return jsonify(RecurringTransactionService.projected_spend(current_user.id, start_date, months))
+
 @transactions.route('/<int:id>', methods=['PUT'])
 @token_required
 def update_transaction(current_user, id):
@@ -101,13 +353,34 @@ def update_transaction(current_user, id):
     
     data = request.get_json()
     
+    # Move the old values out of the monthly rollup before changing them
+    rollup_deltas = {}
+    RollupService.add_delta(
+        rollup_deltas,
+        transaction.user_id,
+        transaction.category_id,
+        transaction.created_at,
+        -transaction.amount_minor,
+        -1
+    )
+    
     transaction.amount = data.get('amount', transaction.amount)
     transaction.description = data.get('description', transaction.description)
     transaction.category_id = data.get('category_id', transaction.category_id   )
     if 'date' in data:
         transaction.created_at = datetime.fromisoformat(data['date'])
     
+    RollupService.add_delta(
+        rollup_deltas,
+        transaction.user_id,
+        transaction.category_id,
+        transaction.created_at,
+        transaction.amount_minor
+    )
+    RollupService.apply(rollup_deltas)
+    
     db.session.commit()
+    BudgetService.invalidate_forecast(current_user.id)
     return jsonify(transaction.to_dict())
 
 @transactions.route('/<int:id>', methods=['DELETE'])
@@ -118,7 +391,9 @@ def delete_transaction(current_user, id):
         return jsonify({'error': 'Unauthorized'}), 403
     
     db.session.delete(transaction)
+    RollupService.record_transaction(transaction, sign=-1)
     db.session.commit()
+    BudgetService.invalidate_forecast(current_user.id)
     return '', 204 
 
 @transactions.route('/<int:id>', methods=['GET'])
@@ -1,7 +1,10 @@
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, jsonify, request, current_app
+from sqlalchemy import or_, func
+from services.pagination_service import PaginationService
+from services.user_service import UserService
 from flask_login import login_required
 from models import db, User
-from routes.auth import token_required, is_admin
+from routes.auth import token_required, is_admin, user_cache
 from datetime import datetime
 
 users = Blueprint('users', __name__)
@@ -10,13 +13,48 @@ users = Blueprint('users', __name__)
 @token_required
 @is_admin
 def get_all_users(current_user):
-    users = User.query.all()
-    return jsonify([{
-        'id': user.id,
-        'name': user.name,
-        'email': user.email,
-        'is_admin': user.is_admin,
-    } for user in users])
+    search = request.args.get('q', '').strip().lower()
+    cursor = request.args.get('cursor')
+    page_size = PaginationService.clamp_page_size(request.args.get('page_size', type=int))
+    count_only = request.args.get('count_only', type=int)
+    
+    query = User.query
+    
+    # Prefix search on email and name, served by the lower(...) pattern indexes
+    if search:
+        pattern = search.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+        query = query.filter(or_(
+            func.lower(User.email).like(pattern, escape='\\'),
+            func.lower(User.name).like(pattern, escape='\\')
+        ))
+    
+    if count_only:
+        return jsonify({'total': query.order_by(None).count()})
+    
+    try:
+        cursor_values = PaginationService.decode_cursor(cursor, 1) if cursor else None
+        if cursor_values:
+            cursor_values = [int(cursor_values[0])]
+    except (ValueError, TypeError):
+        return jsonify({'error': 'Invalid cursor'}), 400
+    
+    users, last_user = PaginationService.paginate(
+        query.with_entities(User.id, User.name, User.email, User.is_admin),
+        [User.id],
+        cursor_values,
+        page_size,
+        descending=False
+    )
+    
+    return jsonify({
+        'users': [{
+            'id': user.id,
+            'name': user.name,
+            'email': user.email,
+            'is_admin': user.is_admin,
+        } for user in users],
+        'next_cursor': PaginationService.encode_cursor(last_user.id) if last_user else None
+    })
 
 @users.route('/<int:user_id>', methods=['DELETE'])
 @token_required
@@ -33,8 +71,14 @@ def delete_user(current_user, user_id):
         if admin_count <= 1:
             return jsonify({'error': 'Cannot delete the last admin user'}), 400
     
-    db.session.delete(user)
-    db.session.commit()
+    # Large accounts can be purged in chunks without holding the request
+    if request.args.get('background', type=int):
+        user_cache.pop(user_id)
+        UserService.purge_user_in_background(current_app._get_current_object(), user_id)
+        return jsonify({'message': 'User deletion started'}), 202
+    
+    UserService.delete_user(user_id)
+    user_cache.pop(user_id)
     
     return jsonify({'message': 'User deleted successfully'})
 
@@ -56,6 +100,7 @@ def toggle_admin(current_user, user_id):
 
     user.is_admin = not user.is_admin
     db.session.commit()
+    user_cache.pop(user_id)
     
     return jsonify({
         'id': user.id,
@@ -0,0 +1,89 @@
+from datetime import timedelta
+from sqlalchemy import func
+from models import db, Transaction, category_cache
+from models.money import from_minor
+
+# Largest number of periods a single series request may span
+MAX_BUCKETS = 400
+
+BUCKET_SPANS = {
+    'day': timedelta(days=1),
+    'week': timedelta(weeks=1),
+    'month': timedelta(days=28)
+}
+
+class AnalyticsService:
+    @staticmethod
+    def bucket_count(start_date, end_date, bucket):
+        """Upper bound on the number of periods between start_date and end_date"""
+        return (end_date - start_date) // BUCKET_SPANS[bucket] + 1
+
+    @staticmethod
+    def spending_series(user_id, start_date, end_date, bucket='day', category_ids=None, top_n=None):
+        """
+        Return spending totals per period and category in [start_date, end_date).
+        Grouping is done in SQL with date_trunc, so the result holds at most
+        one row per (period, category) regardless of transaction volume.
+        With top_n, categories outside the n largest are merged into one
+        series with category_id None.
+        """
+        period = func.date_trunc(bucket, Transaction.created_at).label('period')
+
+        query = db.session.query(
+            period,
+            Transaction.category_id,
+            func.sum(Transaction.amount_minor).label('total'),
+            func.count(Transaction.id).label('count')
+        ).filter(
+            Transaction.user_id == user_id,
+            Transaction.created_at >= start_date,
+            Transaction.created_at < end_date
+        )
+
+        if category_ids:
+            query = query.filter(Transaction.category_id.in_(category_ids))
+
+        rows = query.group_by(period, Transaction.category_id).order_by(period).all()
+
+        category_totals = {}
+        for row in rows:
+            category_totals[row.category_id] = category_totals.get(row.category_id, 0) + row.total
+
+        ranked = sorted(category_totals.items(), key=lambda item: item[1], reverse=True)
+        kept = {category_id for category_id, _ in ranked[:top_n]} if top_n else set(category_totals)
+
+        series = {}
+        period_totals = {}
+        for row in rows:
+            category_id = row.category_id if row.category_id in kept else None
+            key = (row.period, category_id)
+            total, count = series.get(key, (0, 0))
+            series[key] = (total + row.total, count + row.count)
+            period_totals[row.period] = period_totals.get(row.period, 0) + row.total
+
+        categories = [{
+            'category_id': category_id,
+            'category': category_cache.get(category_id),
+            'total': from_minor(total)
+        } for category_id, total in ranked if category_id in kept]
+
+        other_total = sum(total for category_id, total in ranked if category_id not in kept)
+        if other_total:
+            categories.append({'category_id': None, 'category': None, 'total': from_minor(other_total)})
+
+        return {
+            'bucket': bucket,
+            'start_date': start_date.isoformat(),
+            'end_date': end_date.isoformat(),
+            'categories': categories,
+            'series': [{
+                'period': period_start.isoformat(),
+                'category_id': category_id,
+                'total': from_minor(total),
+                'count': count
+            } for (period_start, category_id), (total, count) in series.items()],
+            'totals': [{
+                'period': period_start.isoformat(),
+                'total': from_minor(total)
+            } for period_start, total in period_totals.items()]
+        }
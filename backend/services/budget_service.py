@@ -0,0 +1,219 @@
+import calendar
+from datetime import datetime, date, timedelta
+from sqlalchemy import func, and_, extract, tuple_
+from config import Config
+from models import db, Budget, MonthlyCategoryTotal, recurrence
+from models.money import from_minor
+from services.recurring_transaction_service import RecurringTransactionService
+from services.ttl_cache import TTLCache
+
+# Per-user forecasts; entries also carry the day they were computed for
+forecast_cache = TTLCache(maxsize=Config.BUDGET_FORECAST_CACHE_SIZE, ttl=Config.BUDGET_FORECAST_TTL)
+
+class BudgetService:
+    @staticmethod
+    def month_range(year, month):
+        """
+        Return the half-open [start, end) datetime range covering a month.
+        """
+        start_date = datetime(year, month, 1)
+        if month == 12:
+            end_date = datetime(year + 1, 1, 1)
+        else:
+            end_date = datetime(year, month + 1, 1)
+        return start_date, end_date
+
+    @staticmethod
+    def get_budget_progress(user_id, year, month, category_id=None):
+        """
+        Return (budget, total_minor) pairs for every budget of the month,
+        optionally limited to one category. Spending is read from the
+        monthly_category_totals rollup in the same query, so the cost does not
+        depend on the number of budgets or transactions.
+        """
+        start_date, end_date = BudgetService.month_range(year, month)
+
+        total_minor = func.coalesce(MonthlyCategoryTotal.total_minor, 0)
+
+        query = db.session.query(
+            Budget,
+            total_minor
+        ).outerjoin(
+            MonthlyCategoryTotal,
+            and_(
+                MonthlyCategoryTotal.user_id == Budget.user_id,
+                MonthlyCategoryTotal.category_id == Budget.category_id,
+                MonthlyCategoryTotal.year == year,
+                MonthlyCategoryTotal.month == month
+            )
+        ).filter(
+            Budget.user_id == user_id,
+            Budget.start_date >= start_date.date(),
+            Budget.start_date < end_date.date()
+        )
+
+        if category_id is not None:
+            query = query.filter(Budget.category_id == category_id)
+
+        return query.all()
+
+    @staticmethod
+    def check_budgets(user_id, checks):
+        """
+        Answer many (category_id, date) budget checks with one query.
+        Budgets of every requested category and month are loaded together with
+        their rollup totals; returns one result dict per check, in order.
+        """
+        if not checks:
+            return []
+
+        keys = [(category_id, day.year, day.month) for category_id, day in checks]
+        range_start = BudgetService.month_range(*min((year, month) for _, year, month in keys))[0]
+        range_end = BudgetService.month_range(*max((year, month) for _, year, month in keys))[1]
+
+        total_minor = func.coalesce(MonthlyCategoryTotal.total_minor, 0)
+
+        rows = db.session.query(
+            Budget,
+            total_minor
+        ).outerjoin(
+            MonthlyCategoryTotal,
+            and_(
+                MonthlyCategoryTotal.user_id == Budget.user_id,
+                MonthlyCategoryTotal.category_id == Budget.category_id,
+                MonthlyCategoryTotal.year == extract('year', Budget.start_date),
+                MonthlyCategoryTotal.month == extract('month', Budget.start_date)
+            )
+        ).filter(
+            Budget.user_id == user_id,
+            Budget.category_id.in_({category_id for category_id, _, _ in keys}),
+            Budget.start_date >= range_start.date(),
+            Budget.start_date < range_end.date()
+        ).all()
+
+        budgets_by_key = {}
+        for budget, spent_minor in rows:
+            key = (budget.category_id, budget.start_date.year, budget.start_date.month)
+            budgets_by_key.setdefault(key, (budget, spent_minor))
+
+        results = []
+        for key in keys:
+            if key not in budgets_by_key:
+                results.append({'has_budget': False})
+                continue
+            budget, spent_minor = budgets_by_key[key]
+            results.append(BudgetService.check_result(budget, spent_minor))
+        return results
+
+    @staticmethod
+    def check_result(budget, spent_minor):
+        """Format a budget check response; arithmetic stays in minor units"""
+        return {
+            'has_budget': True,
+            'budget_amount': from_minor(budget.amount_minor),
+            'total_transactions': from_minor(spent_minor),
+            'remaining_amount': from_minor(budget.amount_minor - spent_minor),
+            'is_exceeded': spent_minor >= budget.amount_minor
+        }
+
+    @staticmethod
+    def historical_daily_rates(user_id, category_ids, year, month, months):
+        """
+        Average daily spending (minor units) per category over the `months`
+        full months before year/month, summed from the rollup in one query.
+        """
+        if not category_ids or months <= 0:
+            return {}
+
+        first = recurrence.add_months(date(year, month, 1), -months)
+        periods = [recurrence.add_months(first, offset) for offset in range(months)]
+        days = sum(calendar.monthrange(period.year, period.month)[1] for period in periods)
+
+        rows = db.session.query(
+            MonthlyCategoryTotal.category_id,
+            func.sum(MonthlyCategoryTotal.total_minor)
+        ).filter(
+            MonthlyCategoryTotal.user_id == user_id,
+            MonthlyCategoryTotal.category_id.in_(category_ids),
+            tuple_(MonthlyCategoryTotal.year, MonthlyCategoryTotal.month).in_(
+                [(period.year, period.month) for period in periods]
+            )
+        ).group_by(MonthlyCategoryTotal.category_id).all()
+
+        return {category_id: int(total) / days for category_id, total in rows}
+
+    @staticmethod
+    def recurring_by_category(user_id, start_date, end_date):
+        """Minor units due from active schedules in [start_date, end_date), per category"""
+        totals = {}
+        for row in RecurringTransactionService.active_schedules(user_id, start_date, end_date):
+            count = len(RecurringTransactionService.pending_occurrences(row, start_date, end_date)[1])
+            if count:
+                totals[row.category_id] = totals.get(row.category_id, 0) + count * row.amount_minor
+        return totals
+
+    @staticmethod
+    def forecast(user_id, today=None):
+        """
+        Project each budget of the current month to month end.
+        Spending so far and the historical daily rate come from the rollup and
+        upcoming recurring charges from the user's schedules, so a forecast
+        costs three queries however many budgets or transactions there are.
+        The historical rate already includes past recurring charges, so the
+        known upcoming charges act as a floor instead of being added on top.
+        Results are cached per user for the day and at most BUDGET_FORECAST_TTL
+        seconds; writes call invalidate_forecast in the worker that handled them.
+        Uses local time like get_budgets and the recurring generator, so both
+        agree on the current month.
+        """
+        today = today or datetime.now().date()
+        cached = forecast_cache.get(user_id)
+        if cached is not None and cached[0] == today:
+            return cached[1]
+
+        days_in_month = calendar.monthrange(today.year, today.month)[1]
+        days_elapsed = today.day
+        days_remaining = days_in_month - days_elapsed
+        month_end = today.replace(day=days_in_month) + timedelta(days=1)
+
+        budget_progress = BudgetService.get_budget_progress(user_id, today.year, today.month)
+        category_ids = {budget.category_id for budget, _ in budget_progress}
+        rates = BudgetService.historical_daily_rates(
+            user_id, category_ids, today.year, today.month, Config.BUDGET_FORECAST_HISTORY_MONTHS
+        )
+        recurring = BudgetService.recurring_by_category(user_id, today, month_end) if budget_progress else {}
+
+        budgets = []
+        for budget, spent_minor in budget_progress:
+            spent_minor = int(spent_minor)
+            # Without history, extrapolate from this month's pace
+            daily_rate = rates.get(budget.category_id, spent_minor / days_elapsed)
+            upcoming_minor = recurring.get(budget.category_id, 0)
+            projected_minor = spent_minor + max(round(daily_rate * days_remaining), upcoming_minor)
+
+            budget_dict = budget.to_dict()
+            budget_dict.update({
+                'total_transactions': from_minor(spent_minor),
+                'remaining_amount': from_minor(budget.amount_minor - spent_minor),
+                'daily_rate': from_minor(round(daily_rate)),
+                'upcoming_recurring': from_minor(upcoming_minor),
+                'projected_total': from_minor(projected_minor),
+                'projected_remaining': from_minor(budget.amount_minor - projected_minor),
+                'will_exceed': projected_minor > budget.amount_minor
+            })
+            budgets.append(budget_dict)
+
+        result = {
+            'as_of': today.isoformat(),
+            'year': today.year,
+            'month': today.month,
+            'days_remaining': days_remaining,
+            'budgets': budgets
+        }
+        forecast_cache.set(user_id, (today, result))
+        return result
+
+    @staticmethod
+    def invalidate_forecast(user_id):
+        """Drop a user's cached forecast after their budgets or spending change"""
+        forecast_cache.pop(user_id)
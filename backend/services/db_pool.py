@@ -0,0 +1,102 @@
+import threading
+import time
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool, NullPool
+
+class PoolMetrics:
+    """Process-wide counters for connection checkouts and time spent waiting"""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.checkouts = 0
+            self.timeouts = 0
+            self.connects = 0
+            self.total_wait = 0.0
+            self.max_wait = 0.0
+
+    def record_checkout(self, wait):
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+
+    def record_timeout(self, wait):
+        with self._lock:
+            self.timeouts += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+
+    def record_connect(self):
+        with self._lock:
+            self.connects += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'checkouts': self.checkouts,
+                'timeouts': self.timeouts,
+                'connects': self.connects,
+                'total_wait_ms': round(self.total_wait * 1000, 3),
+                'avg_wait_ms': round(self.total_wait * 1000 / self.checkouts, 3) if self.checkouts else 0.0,
+                'max_wait_ms': round(self.max_wait * 1000, 3)
+            }
+
+pool_metrics = PoolMetrics()
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a connection"""
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            pool_metrics.record_timeout(time.perf_counter() - start)
+            raise
+        pool_metrics.record_checkout(time.perf_counter() - start)
+        return connection
+
+def engine_options(pool_size, max_overflow, pool_timeout, pool_recycle, pre_ping,
+                   statement_timeout_ms, pgbouncer=False, null_pool=False):
+    """
+    Build SQLALCHEMY_ENGINE_OPTIONS.
+    In PgBouncer (transaction pooling) mode no startup options are sent,
+    since PgBouncer rejects them; the statement timeout is applied per
+    transaction by install_statement_timeout instead. psycopg2 never uses
+    server-side prepared statements, so nothing else needs disabling.
+    """
+    options = {'pool_pre_ping': pre_ping}
+
+    if null_pool:
+        # Let PgBouncer do the pooling; every checkout is a fresh client connection
+        options['poolclass'] = NullPool
+    else:
+        options.update({
+            'poolclass': TimedQueuePool,
+            'pool_size': pool_size,
+            'max_overflow': max_overflow,
+            'pool_timeout': pool_timeout,
+            'pool_recycle': pool_recycle
+        })
+
+    if statement_timeout_ms and not pgbouncer:
+        options['connect_args'] = {'options': f'-c statement_timeout={int(statement_timeout_ms)}'}
+
+    return options
+
+def install_statement_timeout(engine, statement_timeout_ms):
+    """Apply the statement timeout with SET LOCAL at the start of every transaction"""
+    timeout = int(statement_timeout_ms)
+
+    @event.listens_for(engine, 'begin')
+    def set_statement_timeout(connection):
+        connection.exec_driver_sql(f'SET LOCAL statement_timeout = {timeout}')
+
+def install_pool_metrics(engine):
+    """Count new DBAPI connections; NullPool checkouts show up here"""
+    @event.listens_for(engine, 'connect')
+    def count_connect(dbapi_connection, connection_record):
+        pool_metrics.record_connect()
@@ -0,0 +1,137 @@
+import csv
+import json
+from datetime import datetime
+from sqlalchemy import insert
+from models import db, Transaction, category_cache
+from models.money import to_minor
+from services.rollup_service import RollupService
+
+DEFAULT_IMPORT_BATCH_SIZE = 1000
+MAX_IMPORT_BATCH_SIZE = 10000
+
+# Only the first errors are returned, so the report stays small
+MAX_REPORTED_ERRORS = 500
+
+class ImportService:
+    @staticmethod
+    def read_csv(stream):
+        """Yield one dict per CSV row; the first line is the header"""
+        for row in csv.DictReader(stream):
+            yield row
+
+    @staticmethod
+    def read_ndjson(stream):
+        """Yield one dict per non-empty JSON line"""
+        for line in stream:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                yield ValueError('Invalid JSON')
+
+    @staticmethod
+    def parse_row(row, user_id, category_ids_by_name, now):
+        """Validate one input row and return the Transaction column values"""
+        if isinstance(row, Exception):
+            raise row
+        if not isinstance(row, dict):
+            raise ValueError('Row must be an object')
+
+        try:
+            amount_minor = to_minor(row.get('amount'))
+        except ValueError:
+            raise ValueError('Invalid amount')
+
+        category_id = row.get('category_id')
+        if category_id not in (None, ''):
+            try:
+                category_id = int(category_id)
+            except (TypeError, ValueError):
+                raise ValueError('Invalid category_id')
+            if category_cache.get(category_id) is None:
+                raise ValueError(f'Unknown category_id {category_id}')
+        else:
+            name = row.get('category') or ''
+            if not isinstance(name, str):
+                raise ValueError('Invalid category')
+            name = name.strip().lower()
+            if name not in category_ids_by_name:
+                raise ValueError(f"Unknown category '{row.get('category')}'")
+            category_id = category_ids_by_name[name]
+
+        date = row.get('date')
+        try:
+            created_at = datetime.fromisoformat(date) if date else now
+        except (TypeError, ValueError):
+            raise ValueError('Invalid date')
+
+        description = row.get('description') or ''
+        if not isinstance(description, str):
+            raise ValueError('Description must be a string')
+        if len(description) > 200:
+            raise ValueError('Description is longer than 200 characters')
+
+        return {
+            'user_id': user_id,
+            'category_id': category_id,
+            'amount_minor': amount_minor,
+            'description': description,
+            'created_at': created_at
+        }
+
+    @staticmethod
+    def import_transactions(user_id, rows, batch_size=DEFAULT_IMPORT_BATCH_SIZE):
+        """
+        Validate and insert rows from an iterator of dicts.
+        Valid rows are written with one bulk INSERT and one rollup upsert per
+        batch, then committed, so memory use does not depend on input size.
+        Invalid rows are skipped and reported by 1-based row number.
+        """
+        _, categories = category_cache.listing()
+        category_ids_by_name = {category['name'].strip().lower(): category['id'] for category in categories}
+        now = datetime.utcnow()
+
+        imported = 0
+        error_count = 0
+        errors = []
+        batch = []
+
+        def flush(batch):
+            db.session.execute(insert(Transaction), batch)
+            rollup_deltas = {}
+            for values in batch:
+                RollupService.add_delta(
+                    rollup_deltas,
+                    values['user_id'],
+                    values['category_id'],
+                    values['created_at'],
+                    values['amount_minor']
+                )
+            RollupService.apply(rollup_deltas)
+            db.session.commit()
+
+        for row_number, row in enumerate(rows, start=1):
+            try:
+                batch.append(ImportService.parse_row(row, user_id, category_ids_by_name, now))
+            except ValueError as e:
+                error_count += 1
+                if len(errors) < MAX_REPORTED_ERRORS:
+                    errors.append({'row': row_number, 'error': str(e)})
+                continue
+
+            if len(batch) >= batch_size:
+                flush(batch)
+                imported += len(batch)
+                batch = []
+
+        if batch:
+            flush(batch)
+            imported += len(batch)
+
+        return {
+            'imported': imported,
+            'failed': error_count,
+            'errors': errors
+        }
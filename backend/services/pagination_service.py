@@ -0,0 +1,58 @@
+import base64
+import json
+from datetime import datetime
+from sqlalchemy import tuple_
+
+class PaginationService:
+    DEFAULT_PAGE_SIZE = 50
+    MAX_PAGE_SIZE = 500
+
+    @staticmethod
+    def encode_cursor(*values):
+        """
+        Encode the sort key of the last row of a page into an opaque cursor.
+        Datetimes are stored as ISO strings.
+        """
+        payload = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+        raw = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+        return base64.urlsafe_b64encode(raw).decode('ascii')
+
+    @staticmethod
+    def decode_cursor(cursor, length):
+        """
+        Decode a cursor produced by encode_cursor into a list of `length` values.
+        Raises ValueError if the cursor is malformed or has the wrong shape.
+        """
+        try:
+            values = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        except Exception:
+            raise ValueError('Invalid cursor')
+        if not isinstance(values, list) or len(values) != length:
+            raise ValueError('Invalid cursor')
+        return values
+
+    @staticmethod
+    def clamp_page_size(page_size):
+        if page_size is None or page_size <= 0:
+            return PaginationService.DEFAULT_PAGE_SIZE
+        return min(page_size, PaginationService.MAX_PAGE_SIZE)
+
+    @staticmethod
+    def paginate(query, columns, cursor, page_size, descending=True):
+        """
+        Apply keyset pagination over `columns`, newest first by default.
+        Returns (rows, last_row); last_row is None when there is no next page.
+        """
+        if cursor:
+            if descending:
+                query = query.filter(tuple_(*columns) < tuple_(*cursor))
+            else:
+                query = query.filter(tuple_(*columns) > tuple_(*cursor))
+
+        query = query.order_by(*[column.desc() if descending else column.asc() for column in columns])
+        rows = query.limit(page_size + 1).all()
+
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            return rows, rows[-1]
+        return rows, None
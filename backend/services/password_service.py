@@ -0,0 +1,59 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from werkzeug.security import generate_password_hash, check_password_hash
+from config import Config
+
+class PasswordHasherBusy(Exception):
+    """Raised when too many password hashes are already queued"""
+
+class PasswordService:
+    """
+    Runs password hashing on a small dedicated thread pool.
+    The pool caps how many KDF computations run at once, and the semaphore
+    caps how many may wait, so a login burst is shed with 503s instead of
+    tying up every request thread.
+    """
+    _executor = ThreadPoolExecutor(
+        max_workers=Config.PASSWORD_HASH_WORKERS,
+        thread_name_prefix='password-hash'
+    )
+    _slots = threading.BoundedSemaphore(Config.PASSWORD_HASH_WORKERS + Config.PASSWORD_HASH_QUEUE_SIZE)
+
+    @staticmethod
+    def _run(fn, *args):
+        if not PasswordService._slots.acquire(timeout=Config.PASSWORD_HASH_QUEUE_TIMEOUT):
+            raise PasswordHasherBusy()
+        try:
+            return PasswordService._executor.submit(fn, *args).result()
+        finally:
+            PasswordService._slots.release()
+
+    @staticmethod
+    def hash_password(password):
+        return PasswordService._run(generate_password_hash, password, Config.PASSWORD_HASH_METHOD)
+
+    @staticmethod
+    def verify_password(password_hash, password):
+        if not password_hash:
+            return False
+        return PasswordService._run(check_password_hash, password_hash, password)
+
+    # Full method string werkzeug writes for PASSWORD_HASH_METHOD, set on first use
+    _method_prefix = None
+
+    @staticmethod
+    def method_prefix():
+        """
+        The configured method as it appears in stored hashes. werkzeug fills
+        in defaults ('scrypt' is written as 'scrypt:32768:8:1'), so it is read
+        from a hash generated once rather than from the config string.
+        """
+        if PasswordService._method_prefix is None:
+            sample = generate_password_hash('', Config.PASSWORD_HASH_METHOD)
+            PasswordService._method_prefix = sample.split('$', 1)[0]
+        return PasswordService._method_prefix
+
+    @staticmethod
+    def needs_rehash(password_hash):
+        """True if the hash was made with different parameters than configured"""
+        return password_hash.split('$', 1)[0] != PasswordService.method_prefix()
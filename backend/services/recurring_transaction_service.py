@@ -1,6 +1,18 @@
-from datetime import datetime, timedelta, date
-from dateutil.relativedelta import relativedelta
-from models import db, Transaction, RecurringTransaction
+import logging
+from datetime import datetime, timedelta
+from sqlalchemy import update, text, or_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from models import db, Transaction, RecurringTransaction, category_cache, recurrence
+from models.money import from_minor
+from services.rollup_service import RollupService
+
+logger = logging.getLogger(__name__)
+
+# Number of due schedules processed per bulk insert/commit
+GENERATION_BATCH_SIZE = 1000
+
+# Postgres advisory lock key held while recurring transactions are generated
+GENERATION_LOCK_KEY = 7217001
 
 class RecurringTransactionService:
     @staticmethod
@@ -13,61 +25,283 @@ class RecurringTransactionService:
         Monthly = next month
         Yearly = next year
         """
-        # Convert from_date to datetime if it's a date
-        if isinstance(from_date, date):
-            from_date = datetime.combine(from_date, datetime.min.time())
-            
-        if frequency == 'daily':
-            next_date = from_date + timedelta(days=1)
-        elif frequency == 'weekly':
-            next_date = from_date + timedelta(weeks=1)
-        elif frequency == 'monthly':
-            next_date = from_date + relativedelta(months=1)
-        elif frequency == 'yearly':
-            next_date = from_date + relativedelta(years=1)
-        else:
+        if frequency not in recurrence.FREQUENCIES:
             return None
-            
-        # Ensure we return a datetime object
-        if isinstance(next_date, date):
-            return datetime.combine(next_date, datetime.min.time())
-        return next_date
+        if isinstance(from_date, datetime):
+            from_date = from_date.date()
+        return datetime.combine(recurrence.next_after(from_date, frequency), datetime.min.time())
+
+    @staticmethod
+    def collect_occurrences(frequency, origin, first_date, until, end_date=None):
+        """
+        Return (occurrences, next_occurrence): every occurrence of the schedule
+        anchored at origin from first_date up to and including until (and
+        end_date, if set), and the first occurrence after them.
+        """
+        if frequency not in recurrence.FREQUENCIES:
+            return ([first_date] if first_date <= until and (end_date is None or first_date <= end_date) else []), None
+        indices = recurrence.index_range(origin, frequency, first_date, until + timedelta(days=1), end_date)
+        occurrences = [recurrence.occurrence(origin, frequency, index) for index in indices]
+        return occurrences, recurrence.occurrence(origin, frequency, indices.stop)
+
+    @staticmethod
+    def pending_occurrences(schedule, start_date, end_date):
+        """
+        Return (origin, indices) for the occurrences of a schedule row in
+        [start_date, end_date) that have not been generated yet. Occurrences
+        are counted from the schedule's created_at date; next_occurrence only
+        marks how far generation has got.
+        """
+        origin = schedule.created_at.date()
+        if schedule.next_occurrence is not None:
+            start_date = max(start_date, schedule.next_occurrence)
+        return origin, recurrence.index_range(origin, schedule.frequency, start_date, end_date, schedule.end_date)
+
+    @staticmethod
+    def active_schedules(user_id, start_date, end_date):
+        """Active schedules of a user that can fire in [start_date, end_date), as column rows"""
+        return db.session.query(
+            RecurringTransaction.id,
+            RecurringTransaction.category_id,
+            RecurringTransaction.amount_minor,
+            RecurringTransaction.description,
+            RecurringTransaction.frequency,
+            RecurringTransaction.created_at,
+            RecurringTransaction.next_occurrence,
+            RecurringTransaction.end_date
+        ).filter(
+            RecurringTransaction.user_id == user_id,
+            RecurringTransaction.is_active == True,
+            RecurringTransaction.next_occurrence.isnot(None),
+            RecurringTransaction.next_occurrence < end_date,
+            RecurringTransaction.frequency.in_(recurrence.FREQUENCIES),
+            or_(RecurringTransaction.end_date.is_(None), RecurringTransaction.end_date >= start_date)
+        ).all()
+
+    @staticmethod
+    def upcoming(user_id, start_date, end_date, limit=None):
+        """
+        List every pending occurrence of the user's schedules in
+        [start_date, end_date), ordered by date. Occurrences are computed, not stored.
+        """
+        items = []
+        for row in RecurringTransactionService.active_schedules(user_id, start_date, end_date):
+            origin, indices = RecurringTransactionService.pending_occurrences(row, start_date, end_date)
+            for index in indices:
+                items.append((recurrence.occurrence(origin, row.frequency, index), row))
+
+        items.sort(key=lambda item: (item[0], item[1].id))
+        if limit is not None:
+            items = items[:limit]
+
+        return [{
+            'date': day.isoformat(),
+            'recurring_transaction_id': row.id,
+            'category_id': row.category_id,
+            'category': category_cache.get(row.category_id),
+            'amount': from_minor(row.amount_minor),
+            'description': row.description,
+            'frequency': row.frequency
+        } for day, row in items]
+
+    @staticmethod
+    def projected_spend(user_id, start_date, months):
+        """
+        Project recurring spend per calendar month for `months` months from
+        the month of start_date (occurrences before start_date are excluded).
+        Occurrences are counted per month in closed form, so the cost is one
+        query plus O(schedules x months) arithmetic.
+        """
+        month_starts = [recurrence.add_months(start_date.replace(day=1), offset) for offset in range(1, months + 1)]
+        boundaries = [start_date] + month_starts
+
+        totals = [{} for _ in range(months)]
+        for row in RecurringTransactionService.active_schedules(user_id, start_date, boundaries[-1]):
+            counts = recurrence.window_counts(
+                row.created_at.date(), row.frequency, boundaries, row.end_date,
+                start=max(start_date, row.next_occurrence)
+            )
+            for month_totals, count in zip(totals, counts):
+                if count:
+                    total_minor, total_count = month_totals.get(row.category_id, (0, 0))
+                    month_totals[row.category_id] = (total_minor + count * row.amount_minor, total_count + count)
+
+        result = []
+        for month_start, month_totals in zip([start_date.replace(day=1)] + month_starts, totals):
+            result.append({
+                'year': month_start.year,
+                'month': month_start.month,
+                'total': from_minor(sum(total for total, _ in month_totals.values())),
+                'count': sum(count for _, count in month_totals.values()),
+                'categories': [{
+                    'category_id': category_id,
+                    'category': category_cache.get(category_id),
+                    'total': from_minor(total),
+                    'count': count
+                } for category_id, (total, count) in sorted(month_totals.items(), key=lambda item: item[1][0], reverse=True)]
+            })
+
+        return {
+            'start_date': start_date.isoformat(),
+            'months': result,
+            'total': from_minor(sum(
+                total for month_totals in totals for total, _ in month_totals.values()
+            ))
+        }
 
     @staticmethod
-    def generate_pending_transactions():
-        """Generate transactions for all active recurring transactions that are due"""
-        print("Generating pending transactions")
+    def generate_pending_transactions(catch_up=False, batch_size=GENERATION_BATCH_SIZE):
+        """
+        Generate transactions for all active recurring transactions that are due.
+        By default only schedules due today fire; with catch_up=True every
+        occurrence missed since next_occurrence is materialized as well.
+        Due schedules are selected in SQL and processed in id-ordered batches
+        with bulk INSERT/UPDATE statements and one commit per batch. Rows are
+        keyed by (recurring_transaction_id, occurrence_date), so reruns never
+        duplicate them.
+        Returns a dict mapping schedule id to the number of transactions created.
+        """
         today = datetime.now().date()
-        recurring_transactions = RecurringTransaction.query.filter_by(is_active=True).all()
-        
-        for recurring_tx in recurring_transactions:
-            next_date = recurring_tx.next_occurrence
-            # Skip if no next occurrence or if it's not today
-            if not next_date or next_date != today:
-                continue
-            
-            if recurring_tx.end_date and next_date > recurring_tx.end_date:
-                recurring_tx.is_active = False
-                continue
-
-            new_transaction = Transaction(
-                user_id=recurring_tx.user_id,
-                category_id=recurring_tx.category_id,
-                amount=recurring_tx.amount,
-                description=f"{recurring_tx.description} (Chi phí lặp lại)",
-                created_at=datetime.fromisoformat(next_date.isoformat()),
-                updated_at=datetime.fromisoformat(next_date.isoformat())
+        if catch_up:
+            is_due = RecurringTransaction.next_occurrence <= today
+        else:
+            is_due = RecurringTransaction.next_occurrence == today
+
+        # Deactivate due schedules whose next occurrence is past their end date
+        db.session.execute(
+            update(RecurringTransaction)
+            .where(
+                RecurringTransaction.is_active == True,
+                is_due,
+                RecurringTransaction.end_date.isnot(None),
+                RecurringTransaction.end_date < RecurringTransaction.next_occurrence
             )
+            .values(is_active=False)
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+
+        created = {}
 
-            recurring_tx.last_generated = next_date
-            recurring_tx.next_occurrence = RecurringTransactionService.calculate_next_occurrence(
-                recurring_tx.frequency, 
-                next_date
+        def insert_rows(rows):
+            result = db.session.execute(
+                pg_insert(Transaction)
+                .on_conflict_do_nothing(constraint='uq_transaction_recurring_occurrence')
+                .returning(
+                    Transaction.recurring_transaction_id,
+                    Transaction.user_id,
+                    Transaction.category_id,
+                    Transaction.created_at,
+                    Transaction.amount_minor
+                ),
+                rows
             )
-            print(f"Creating new transaction for recurring transaction {recurring_tx.id}, next_occurrence: {next_date}")
+            # Only rows actually inserted count towards the report and rollup
+            rollup_deltas = {}
+            for schedule_id, user_id, category_id, created_at, amount_minor in result:
+                created[schedule_id] = created.get(schedule_id, 0) + 1
+                RollupService.add_delta(rollup_deltas, user_id, category_id, created_at, amount_minor)
+            RollupService.apply(rollup_deltas)
 
-            
-            db.session.add(new_transaction)
-            print(f"New transaction created: {new_transaction.to_dict()}")
-        
-        db.session.commit() 
\ No newline at end of file
+        last_id = 0
+        while True:
+            due = db.session.query(
+                RecurringTransaction.id,
+                RecurringTransaction.user_id,
+                RecurringTransaction.category_id,
+                RecurringTransaction.amount_minor,
+                RecurringTransaction.description,
+                RecurringTransaction.frequency,
+                RecurringTransaction.created_at,
+                RecurringTransaction.last_generated,
+                RecurringTransaction.next_occurrence,
+                RecurringTransaction.end_date
+            ).filter(
+                RecurringTransaction.is_active == True,
+                is_due,
+                RecurringTransaction.id > last_id
+            ).order_by(
+                RecurringTransaction.id
+            ).limit(batch_size).all()
+
+            if not due:
+                break
+
+            rows = []
+            advances = []
+            for schedule in due:
+                occurrences, next_occurrence = RecurringTransactionService.collect_occurrences(
+                    schedule.frequency,
+                    schedule.created_at.date(),
+                    schedule.next_occurrence,
+                    today,
+                    schedule.end_date
+                )
+                if not occurrences:
+                    # A next_occurrence stored off the schedule's anchor (older
+                    # rows drifted after short months) is moved back onto it
+                    if next_occurrence is not None and next_occurrence != schedule.next_occurrence:
+                        advances.append({
+                            'id': schedule.id,
+                            'last_generated': schedule.last_generated,
+                            'next_occurrence': next_occurrence
+                        })
+                    continue
+
+                for occurrence in occurrences:
+                    created_at = datetime.combine(occurrence, datetime.min.time())
+                    rows.append({
+                        'user_id': schedule.user_id,
+                        'category_id': schedule.category_id,
+                        'amount_minor': schedule.amount_minor,
+                        'description': f"{schedule.description} (Chi phí lặp lại)",
+                        'created_at': created_at,
+                        'updated_at': created_at,
+                        'recurring_transaction_id': schedule.id,
+                        'occurrence_date': occurrence
+                    })
+                    # Keep memory bounded for long catch-up backlogs
+                    if len(rows) >= batch_size:
+                        insert_rows(rows)
+                        rows = []
+
+                advances.append({
+                    'id': schedule.id,
+                    'last_generated': occurrences[-1],
+                    'next_occurrence': next_occurrence
+                })
+
+            if rows:
+                insert_rows(rows)
+            if advances:
+                db.session.execute(update(RecurringTransaction), advances)
+
+            db.session.commit()
+            last_id = due[-1].id
+
+        logger.info("Generated %d recurring transactions for %d schedules", sum(created.values()), len(created))
+        return created
+
+    @staticmethod
+    def generate_exclusively(catch_up=True):
+        """
+        Run generate_pending_transactions only if no other process is running it.
+        Uses a Postgres session advisory lock, so with several workers exactly
+        one generates and the others skip. Returns None when skipped.
+        Session locks need a direct connection, not PgBouncer transaction pooling.
+        """
+        with db.engine.connect() as connection:
+            acquired = connection.execute(
+                text('SELECT pg_try_advisory_lock(:key)'),
+                {'key': GENERATION_LOCK_KEY}
+            ).scalar()
+            if not acquired:
+                logger.info("Recurring transaction generation skipped: already running elsewhere")
+                return None
+            try:
+                return RecurringTransactionService.generate_pending_transactions(catch_up=catch_up)
+            finally:
+                connection.execute(
+                    text('SELECT pg_advisory_unlock(:key)'),
+                    {'key': GENERATION_LOCK_KEY}
+                )
@@ -0,0 +1,116 @@
+import itertools
+import threading
+import time
+from functools import wraps
+from flask import g, has_request_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import QueuePool
+from services.db_pool import TimedQueuePool
+from services.ttl_cache import TTLCache
+
+class ReplicaRouter:
+    """
+    Routes reads of read-only requests to healthy replicas.
+    A replica is used only while its replay lag is below REPLICA_MAX_LAG_SECONDS.
+    Responses to requests that committed carry the write time in the
+    X-Last-Write header; clients echo it back, and requests that wrote within
+    READ_YOUR_WRITES_SECONDS keep reading from the primary on any worker.
+    """
+    # Seconds a measured replica lag is reused before asking again
+    LAG_CHECK_INTERVAL = 2
+
+    # Response header with the last write time; clients send it back unchanged
+    LAST_WRITE_HEADER = 'X-Last-Write'
+
+    def __init__(self):
+        self.engines = []
+        self.max_lag = 5
+        self.read_your_writes = 10
+        self._lag_cache = TTLCache(maxsize=64, ttl=self.LAG_CHECK_INTERVAL)
+        self._cycle = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        urls = [url.strip() for url in app.config.get('DATABASE_REPLICA_URLS', '').split(',') if url.strip()]
+        options = dict(app.config.get('SQLALCHEMY_ENGINE_OPTIONS', {}))
+        # Keep replica checkouts out of the primary's pool metrics
+        if options.get('poolclass') is TimedQueuePool:
+            options['poolclass'] = QueuePool
+        self.engines = [create_engine(url, **options) for url in urls]
+        self.max_lag = app.config.get('REPLICA_MAX_LAG_SECONDS', 5)
+        self.read_your_writes = app.config.get('READ_YOUR_WRITES_SECONDS', 10)
+        self._cycle = itertools.cycle(range(len(self.engines))) if self.engines else None
+
+        @app.after_request
+        def stamp_last_write(response):
+            if g.get('wrote') and response.status_code < 400:
+                response.headers[self.LAST_WRITE_HEADER] = f'{time.time():.3f}'
+            return response
+
+    def wrote_recently(self, last_write):
+        """Whether a client-reported X-Last-Write value is within the read-your-writes window"""
+        try:
+            age = time.time() - float(last_write)
+        except (TypeError, ValueError):
+            return False
+        # Values from the future are not trusted, so they cannot pin a client forever
+        return -self.read_your_writes < age < self.read_your_writes
+
+    def lag(self, index):
+        """Replay lag of a replica in seconds, or None if it is unreachable"""
+        cached = self._lag_cache.get(index, default=False)
+        if cached is not False:
+            return cached
+        try:
+            with self.engines[index].connect() as connection:
+                lag = connection.execute(text(
+                    'SELECT COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)'
+                )).scalar()
+                lag = float(lag)
+        except Exception:
+            lag = None
+        self._lag_cache.set(index, lag)
+        return lag
+
+    def engine_for_read(self, last_write=None):
+        """Return a replica engine for this read, or None to use the primary"""
+        if not self.engines:
+            return None
+        if self.wrote_recently(last_write):
+            return None
+        for _ in range(len(self.engines)):
+            with self._lock:
+                index = next(self._cycle)
+            lag = self.lag(index)
+            if lag is not None and lag <= self.max_lag:
+                return self.engines[index]
+        return None
+
+replica_router = ReplicaRouter()
+
+def read_only(f):
+    """Mark a request as read-only so its queries may be served by a replica"""
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        g.use_replica = True
+        return f(*args, **kwargs)
+    return decorated
+
+class RoutingSession(Session):
+    """Session that sends reads of read-only requests to a replica"""
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and not self._flushing and has_request_context() and g.get('use_replica'):
+            if 'replica_engine' not in g:
+                g.replica_engine = replica_router.engine_for_read(
+                    request.headers.get(ReplicaRouter.LAST_WRITE_HEADER)
+                )
+            if g.replica_engine is not None:
+                return g.replica_engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+    def commit(self):
+        super().commit()
+        # Only requests that actually committed count as writes for read-your-writes
+        if has_request_context():
+            g.wrote = True
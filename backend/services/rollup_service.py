@@ -0,0 +1,115 @@
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from models import db, MonthlyCategoryTotal
+
+# Monthly totals recomputed from the raw transaction table
+COMPUTED_TOTALS_SQL = """
+    SELECT user_id,
+           category_id,
+           EXTRACT(YEAR FROM created_at)::int AS year,
+           EXTRACT(MONTH FROM created_at)::int AS month,
+           SUM(amount_minor) AS total_minor,
+           COUNT(*) AS transaction_count
+    FROM "transaction"
+    GROUP BY 1, 2, 3, 4
+"""
+
+class RollupService:
+    @staticmethod
+    def add_delta(deltas, user_id, category_id, created_at, amount_minor, count=1):
+        """Accumulate a change (in minor units) to one month's total into `deltas`"""
+        key = (user_id, category_id, created_at.year, created_at.month)
+        total_minor, transaction_count = deltas.get(key, (0, 0))
+        deltas[key] = (total_minor + int(amount_minor), transaction_count + count)
+
+    @staticmethod
+    def apply(deltas):
+        """
+        Add accumulated deltas to monthly_category_totals with one upsert.
+        Runs in the caller's transaction, so the rollup commits with the write.
+        """
+        rows = [{
+            'user_id': user_id,
+            'category_id': category_id,
+            'year': year,
+            'month': month,
+            'total_minor': total_minor,
+            'transaction_count': transaction_count
+        } for (user_id, category_id, year, month), (total_minor, transaction_count) in sorted(deltas.items())
+            if total_minor or transaction_count]
+
+        if not rows:
+            return
+
+        stmt = pg_insert(MonthlyCategoryTotal).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['user_id', 'category_id', 'year', 'month'],
+            set_={
+                'total_minor': MonthlyCategoryTotal.total_minor + stmt.excluded.total_minor,
+                'transaction_count': MonthlyCategoryTotal.transaction_count + stmt.excluded.transaction_count
+            }
+        )
+        db.session.execute(stmt)
+
+    @staticmethod
+    def record_transaction(transaction, sign=1):
+        """Add (sign=1) or remove (sign=-1) a transaction from the rollup"""
+        deltas = {}
+        RollupService.add_delta(
+            deltas,
+            transaction.user_id,
+            transaction.category_id,
+            transaction.created_at,
+            sign * transaction.amount_minor,
+            sign
+        )
+        RollupService.apply(deltas)
+
+    @staticmethod
+    def diff():
+        """
+        Compare the rollup with totals recomputed from transactions.
+        Returns a list of rows that are missing, extra or different.
+        """
+        rows = db.session.execute(text(f"""
+            WITH computed AS ({COMPUTED_TOTALS_SQL})
+            SELECT COALESCE(c.user_id, m.user_id) AS user_id,
+                   COALESCE(c.category_id, m.category_id) AS category_id,
+                   COALESCE(c.year, m.year) AS year,
+                   COALESCE(c.month, m.month) AS month,
+                   c.total_minor AS expected_total_minor,
+                   m.total_minor AS live_total_minor,
+                   c.transaction_count AS expected_count,
+                   m.transaction_count AS live_count
+            FROM computed c
+            FULL OUTER JOIN monthly_category_totals m
+              ON c.user_id = m.user_id
+             AND c.category_id = m.category_id
+             AND c.year = m.year
+             AND c.month = m.month
+            WHERE (c.user_id IS NULL AND m.transaction_count <> 0)
+               OR m.user_id IS NULL
+               OR c.transaction_count <> m.transaction_count
+               OR c.total_minor <> m.total_minor
+            ORDER BY 1, 2, 3, 4
+        """)).mappings().all()
+        return [dict(row) for row in rows]
+
+    @staticmethod
+    def rebuild(dry_run=False):
+        """
+        Recompute monthly_category_totals from scratch.
+        Returns the differences found against the live table before rebuilding.
+        """
+        differences = RollupService.diff()
+        if dry_run:
+            return differences
+
+        db.session.execute(text('LOCK TABLE monthly_category_totals IN EXCLUSIVE MODE'))
+        db.session.execute(text('DELETE FROM monthly_category_totals'))
+        db.session.execute(text(f"""
+            INSERT INTO monthly_category_totals (user_id, category_id, year, month, total_minor, transaction_count)
+            {COMPUTED_TOTALS_SQL}
+        """))
+        db.session.commit()
+        return differences
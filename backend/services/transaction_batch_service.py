@@ -0,0 +1,135 @@
+from datetime import datetime
+from sqlalchemy import insert, update, delete
+from models import db, Transaction
+from models.money import to_minor
+from services.rollup_service import RollupService
+
+MAX_BATCH_OPERATIONS = 500
+
+class TransactionBatchService:
+    @staticmethod
+    def parse_values(data, partial=False):
+        """Convert request fields into Transaction column values"""
+        if not isinstance(data, dict):
+            raise ValueError('data must be an object')
+
+        values = {}
+        if 'amount' in data or not partial:
+            values['amount_minor'] = to_minor(data['amount'])
+        if 'description' in data or not partial:
+            values['description'] = data.get('description')
+        if 'category_id' in data or not partial:
+            values['category_id'] = int(data['category_id'])
+        if 'date' in data:
+            values['created_at'] = datetime.fromisoformat(data['date'])
+        elif not partial:
+            values['created_at'] = datetime.utcnow()
+        return values
+
+    @staticmethod
+    def apply(user_id, operations):
+        """
+        Validate and apply create/update/delete operations atomically.
+        Ownership of every referenced id is checked with one query; writes use
+        one bulk INSERT, one bulk UPDATE and one DELETE, followed by a single
+        commit. Returns (ok, results) with one result per operation; when ok
+        is False nothing was written.
+        """
+        results = []
+        creates = []
+        updates = []
+        deletes = []
+        seen_ids = set()
+
+        for index, operation in enumerate(operations):
+            op = operation.get('op') if isinstance(operation, dict) else None
+            result = {'index': index, 'op': op}
+            results.append(result)
+            try:
+                if op == 'create':
+                    creates.append((index, TransactionBatchService.parse_values(operation.get('data'))))
+                elif op in ('update', 'delete'):
+                    transaction_id = int(operation['id'])
+                    if transaction_id in seen_ids:
+                        raise ValueError(f'Transaction {transaction_id} appears more than once')
+                    seen_ids.add(transaction_id)
+                    result['id'] = transaction_id
+                    if op == 'update':
+                        values = TransactionBatchService.parse_values(operation.get('data'), partial=True)
+                        updates.append((index, transaction_id, values))
+                    else:
+                        deletes.append((index, transaction_id))
+                else:
+                    raise ValueError("op must be 'create', 'update' or 'delete'")
+            except (KeyError, TypeError, ValueError) as e:
+                result.update({'status': 400, 'error': str(e) or 'Invalid operation'})
+
+        # One ownership query for every referenced transaction, locking the rows
+        existing = {}
+        if seen_ids:
+            existing = {row.id: row for row in db.session.query(
+                Transaction.id,
+                Transaction.user_id,
+                Transaction.category_id,
+                Transaction.created_at,
+                Transaction.amount_minor
+            ).filter(Transaction.id.in_(seen_ids)).with_for_update()}
+
+        for result in results:
+            if 'id' not in result or 'status' in result:
+                continue
+            row = existing.get(result['id'])
+            if row is None:
+                result.update({'status': 404, 'error': 'Transaction not found'})
+            elif row.user_id != user_id:
+                result.update({'status': 403, 'error': 'Unauthorized'})
+
+        if any('status' in result for result in results):
+            for result in results:
+                result.setdefault('status', 424)
+                result.setdefault('error', 'Not applied because another operation failed')
+            return False, results
+
+        rollup_deltas = {}
+
+        if creates:
+            rows = [dict(values, user_id=user_id) for _, values in creates]
+            new_ids = db.session.execute(
+                insert(Transaction).returning(Transaction.id, sort_by_parameter_order=True),
+                rows
+            ).scalars().all()
+            for (index, values), new_id in zip(creates, new_ids):
+                results[index].update({'id': new_id, 'status': 201})
+                RollupService.add_delta(rollup_deltas, user_id, values['category_id'], values['created_at'], values['amount_minor'])
+
+        if updates:
+            params = []
+            for index, transaction_id, values in updates:
+                old = existing[transaction_id]
+                new = {
+                    'category_id': values.get('category_id', old.category_id),
+                    'created_at': values.get('created_at', old.created_at),
+                    'amount_minor': values.get('amount_minor', old.amount_minor)
+                }
+                RollupService.add_delta(rollup_deltas, user_id, old.category_id, old.created_at, -old.amount_minor, -1)
+                RollupService.add_delta(rollup_deltas, user_id, new['category_id'], new['created_at'], new['amount_minor'])
+                if values:
+                    params.append(dict(values, id=transaction_id))
+                results[index]['status'] = 200
+            if params:
+                db.session.execute(update(Transaction), params)
+
+        if deletes:
+            for index, transaction_id in deletes:
+                old = existing[transaction_id]
+                RollupService.add_delta(rollup_deltas, user_id, old.category_id, old.created_at, -old.amount_minor, -1)
+                results[index]['status'] = 204
+            db.session.execute(
+                delete(Transaction)
+                .where(Transaction.id.in_([transaction_id for _, transaction_id in deletes]))
+                .execution_options(synchronize_session=False)
+            )
+
+        RollupService.apply(rollup_deltas)
+        db.session.commit()
+        return True, results
@@ -0,0 +1,56 @@
+import logging
+import threading
+from sqlalchemy import delete, select
+from models import db, User, Transaction, RecurringTransaction, Budget, MonthlyCategoryTotal
+
+logger = logging.getLogger(__name__)
+
+# Rows removed per statement/commit when purging an account in the background
+PURGE_CHUNK_SIZE = 5000
+
+class UserService:
+    @staticmethod
+    def delete_user(user_id):
+        """Delete a user; owned rows are removed by ON DELETE CASCADE in the database"""
+        db.session.execute(delete(User).where(User.id == user_id))
+        db.session.commit()
+
+    @staticmethod
+    def purge_user(user_id, chunk_size=PURGE_CHUNK_SIZE):
+        """
+        Delete a user's rows in chunks, committing after each one so no single
+        statement holds locks for long, then delete the user itself.
+        """
+        for model in (Transaction, RecurringTransaction, Budget, MonthlyCategoryTotal):
+            while True:
+                if model is MonthlyCategoryTotal:
+                    result = db.session.execute(
+                        delete(MonthlyCategoryTotal).where(MonthlyCategoryTotal.user_id == user_id)
+                    )
+                else:
+                    chunk = select(model.id).where(model.user_id == user_id).limit(chunk_size).scalar_subquery()
+                    result = db.session.execute(
+                        delete(model).where(model.id.in_(chunk)).execution_options(synchronize_session=False)
+                    )
+                db.session.commit()
+                if model is MonthlyCategoryTotal or result.rowcount < chunk_size:
+                    break
+
+        # Anything written meanwhile is removed by the cascade
+        UserService.delete_user(user_id)
+
+    @staticmethod
+    def purge_user_in_background(app, user_id, chunk_size=PURGE_CHUNK_SIZE):
+        """Run purge_user on a daemon thread and return immediately"""
+        def run():
+            with app.app_context():
+                try:
+                    UserService.purge_user(user_id, chunk_size=chunk_size)
+                    logger.info("Purged user %s", user_id)
+                except Exception:
+                    logger.exception("Error purging user %s", user_id)
+                    db.session.rollback()
+
+        thread = threading.Thread(target=run, name=f'purge-user-{user_id}', daemon=True)
+        thread.start()
+        return thread
@@ -0,0 +1,87 @@
+import os
+import sys
+from contextlib import contextmanager
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+# Database tests run against a disposable Postgres database; they are skipped
+# unless TEST_DATABASE_URL is set. Its tables are truncated after every test.
+TEST_DATABASE_URL = os.environ.get('TEST_DATABASE_URL')
+
+if TEST_DATABASE_URL:
+    # Config reads the environment at import time, so set it before app is imported
+    os.environ['DATABASE_URL'] = TEST_DATABASE_URL
+    os.environ['DATABASE_REPLICA_URLS'] = ''
+    os.environ['SCHEDULER_ENABLED'] = 'false'
+    os.environ['RECURRING_ON_STARTUP'] = 'false'
+
+@pytest.fixture(scope='session')
+def app():
+    if not TEST_DATABASE_URL:
+        pytest.skip('TEST_DATABASE_URL is not set')
+    from app import app as flask_app
+    flask_app.config['TESTING'] = True
+    return flask_app
+
+@pytest.fixture
+def db(app):
+    from sqlalchemy import text
+    from models import db as database, category_cache
+    from routes.auth import user_cache
+    from services.budget_service import forecast_cache
+
+    with app.app_context():
+        yield database
+
+        database.session.rollback()
+        tables = ', '.join(f'"{table.name}"' for table in database.metadata.sorted_tables)
+        database.session.execute(text(f'TRUNCATE {tables} RESTART IDENTITY CASCADE'))
+        database.session.commit()
+        category_cache.invalidate()
+        user_cache.clear()
+        forecast_cache.clear()
+
+@pytest.fixture
+def client(app, db):
+    return app.test_client()
+
+@pytest.fixture
+def user(db):
+    from models import User
+    user = User(email='user@example.com', name='Test User')
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+@pytest.fixture
+def auth_headers(user):
+    from routes.auth import create_token
+    return {'Authorization': f'Bearer {create_token(user)}'}
+
+@pytest.fixture
+def category(db):
+    from models import Category
+    category = Category(name='Ăn uống', icon='food')
+    db.session.add(category)
+    db.session.commit()
+    return category
+
+@pytest.fixture
+def count_statements(db):
+    """Context manager collecting every SQL statement sent to the database"""
+    from sqlalchemy import event
+
+    @contextmanager
+    def counter():
+        statements = []
+        def count(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+        event.listen(db.engine, 'before_cursor_execute', count)
+        try:
+            yield statements
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', count)
+    return counter
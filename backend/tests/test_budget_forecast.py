@@ -0,0 +1,81 @@
+from datetime import date, datetime
+from models import Budget, MonthlyCategoryTotal, RecurringTransaction
+from services.budget_service import BudgetService
+
+TODAY = date(2026, 1, 10)
+
+def add_budget(db, user, category, amount):
+    db.session.add(Budget(
+        user_id=user.id, category_id=category.id, amount=amount,
+        start_date=date(2026, 1, 1), end_date=date(2026, 1, 31)
+    ))
+
+def add_total(db, user, category, year, month, total_minor):
+    db.session.add(MonthlyCategoryTotal(
+        user_id=user.id, category_id=category.id, year=year, month=month,
+        total_minor=total_minor, transaction_count=1
+    ))
+
+def test_forecast_extrapolates_historical_rate(db, user, category):
+    add_budget(db, user, category, 1000)
+    add_total(db, user, category, 2026, 1, 10000)
+    # 9,200.00 over Oct-Dec (92 days) is 100.00 per day
+    add_total(db, user, category, 2025, 10, 300000)
+    add_total(db, user, category, 2025, 11, 300000)
+    add_total(db, user, category, 2025, 12, 320000)
+    db.session.commit()
+
+    forecast = BudgetService.forecast(user.id, today=TODAY)
+
+    assert forecast['days_remaining'] == 21
+    [budget] = forecast['budgets']
+    assert budget['total_transactions'] == 100.0
+    assert budget['daily_rate'] == 100.0
+    assert budget['projected_total'] == 100.0 + 21 * 100.0
+    assert budget['will_exceed'] is True
+
+def test_forecast_uses_upcoming_recurring_as_floor(db, user, category):
+    add_budget(db, user, category, 500)
+    db.session.add(RecurringTransaction(
+        user_id=user.id, category_id=category.id, amount=50, description='Internet',
+        frequency='weekly', created_at=datetime(2026, 1, 5), next_occurrence=date(2026, 1, 12),
+        is_active=True
+    ))
+    db.session.commit()
+
+    [budget] = BudgetService.forecast(user.id, today=TODAY)['budgets']
+
+    # No spending history; Jan 12, 19 and 26 are still to come
+    assert budget['daily_rate'] == 0.0
+    assert budget['upcoming_recurring'] == 150.0
+    assert budget['projected_total'] == 150.0
+    assert budget['will_exceed'] is False
+
+def test_forecast_is_cached_per_day(db, user, category, count_statements):
+    add_budget(db, user, category, 100)
+    db.session.commit()
+    BudgetService.forecast(user.id, today=TODAY)
+
+    with count_statements() as statements:
+        BudgetService.forecast(user.id, today=TODAY)
+    assert statements == []
+
+    with count_statements() as statements:
+        BudgetService.forecast(user.id, today=date(2026, 1, 11))
+    assert statements
+
+def test_writes_invalidate_forecast(client, db, user, auth_headers, category):
+    today = datetime.now()
+    client.post('/budgets', headers=auth_headers, json={
+        'amount': 100, 'category_id': category.id,
+        'start_date': today.replace(day=1).date().isoformat(), 'end_date': today.date().isoformat()
+    })
+    before = client.get('/budgets/forecast', headers=auth_headers).get_json()
+    assert before['month'] == today.month
+    assert before['budgets'][0]['total_transactions'] == 0.0
+
+    client.post('/transactions', headers=auth_headers, json={
+        'amount': 40, 'description': 'Ăn trưa', 'category_id': category.id, 'date': today.isoformat()
+    })
+    after = client.get('/budgets/forecast', headers=auth_headers).get_json()
+    assert after['budgets'][0]['total_transactions'] == 40.0
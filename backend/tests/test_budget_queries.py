@@ -0,0 +1,45 @@
+from datetime import date
+from models import Budget, Category, MonthlyCategoryTotal, category_cache
+
+def add_budgets(db, user, count):
+    categories = [Category(name=f'Danh mục {index}') for index in range(count)]
+    db.session.add_all(categories)
+    db.session.flush()
+    for index, category in enumerate(categories):
+        db.session.add(Budget(
+            user_id=user.id,
+            category_id=category.id,
+            amount=100,
+            start_date=date(2026, 1, 1),
+            end_date=date(2026, 1, 31)
+        ))
+        db.session.add(MonthlyCategoryTotal(
+            user_id=user.id, category_id=category.id, year=2026, month=1,
+            total_minor=1000 * (index + 1), transaction_count=1
+        ))
+    db.session.commit()
+
+def budget_list_statements(client, auth_headers, count_statements):
+    # Reload the category cache first so both runs measure only the budget listing
+    category_cache.invalidate()
+    client.get('/categories', headers=auth_headers)
+    with count_statements() as statements:
+        response = client.get('/budgets?year=2026&month=1', headers=auth_headers)
+    assert response.status_code == 200
+    return len(statements), response.get_json()
+
+def test_budget_list_statements_do_not_grow_with_budgets(client, db, user, auth_headers, count_statements):
+    add_budgets(db, user, 1)
+    single, budgets = budget_list_statements(client, auth_headers, count_statements)
+    assert len(budgets) == 1
+
+    db.session.query(Budget).delete()
+    db.session.query(MonthlyCategoryTotal).delete()
+    db.session.commit()
+    add_budgets(db, user, 50)
+    many, budgets = budget_list_statements(client, auth_headers, count_statements)
+
+    assert len(budgets) == 50
+    assert sorted(budget['total_transactions'] for budget in budgets) == [10.0 * n for n in range(1, 51)]
+    assert many == single
+    assert all(budget['category'] is not None for budget in budgets)
@@ -0,0 +1,32 @@
+import json
+from datetime import datetime
+import pytest
+from services.import_service import ImportService
+
+@pytest.mark.parametrize('row', [
+    {'amount': 1, 'category': 'food', 'description': 5},
+    {'amount': 1, 'category': 'food', 'description': ['a']},
+    {'amount': 1, 'category': 7},
+    {'amount': 1, 'category': 'food', 'date': 20260101},
+    {'amount': {'value': 1}, 'category': 'food'},
+])
+def test_parse_row_rejects_wrong_types(row):
+    with pytest.raises(ValueError):
+        ImportService.parse_row(row, 1, {'food': 1}, datetime(2026, 1, 1))
+
+def test_import_reports_bad_rows(client, auth_headers, category):
+    rows = [
+        {'amount': 12.5, 'category_id': category.id, 'description': 'ok'},
+        {'amount': 3, 'category_id': category.id, 'description': 5},
+        {'amount': 4, 'category_id': category.id}
+    ]
+    response = client.post(
+        '/transactions/import',
+        headers=auth_headers,
+        data='\n'.join(json.dumps(row) for row in rows),
+        content_type='application/x-ndjson'
+    )
+    assert response.status_code == 201
+    body = response.get_json()
+    assert body['imported'] == 2
+    assert body['errors'] == [{'row': 2, 'error': 'Description must be a string'}]
@@ -0,0 +1,77 @@
+import io
+import os
+import time
+import tracemalloc
+import pytest
+from models import Transaction
+from services.rollup_service import RollupService
+
+# Opt-in: streams IMPORT_BENCHMARK_ROWS generated rows through /transactions/import
+pytestmark = pytest.mark.skipif(not os.environ.get('RUN_BENCHMARKS'), reason='RUN_BENCHMARKS is not set')
+
+IMPORT_BENCHMARK_ROWS = int(os.environ.get('IMPORT_BENCHMARK_ROWS', 100000))
+
+class GeneratedBody(io.RawIOBase):
+    """CSV upload produced row by row, so the test never holds the whole body"""
+
+    def __init__(self, rows, category):
+        self.lines = self.generate(rows, category)
+        self.pending = b''
+        self.size = 0
+
+    @staticmethod
+    def generate(rows, category):
+        yield b'date,amount,description,category\n'
+        for number in range(rows):
+            day = 1 + number % 28
+            month = 1 + number // 28 % 12
+            yield f'2025-{month:02d}-{day:02d}T12:00:00,{number % 5000 / 100:.2f},Row {number},{category}\n'.encode('utf-8')
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        while len(self.pending) < len(buffer):
+            line = next(self.lines, None)
+            if line is None:
+                break
+            self.pending += line
+        size = min(len(buffer), len(self.pending))
+        buffer[:size] = self.pending[:size]
+        self.pending = self.pending[size:]
+        self.size += size
+        return size
+
+def run_import(client, auth_headers, category):
+    body = GeneratedBody(IMPORT_BENCHMARK_ROWS, category.name)
+    response = client.post(
+        '/transactions/import?batch_size=1000',
+        headers=dict(auth_headers, **{'Content-Type': 'text/csv'}),
+        # No Content-Length: the body is chunked, like a streamed upload
+        environ_overrides={'wsgi.input': io.BufferedReader(body), 'wsgi.input_terminated': True}
+    )
+    assert response.status_code == 201
+    assert response.get_json()['imported'] == IMPORT_BENCHMARK_ROWS
+    return body.size
+
+def test_import_throughput_and_peak_memory(db, client, auth_headers, category):
+    started = time.perf_counter()
+    body_size = run_import(client, auth_headers, category)
+    elapsed = time.perf_counter() - started
+    assert Transaction.query.count() == IMPORT_BENCHMARK_ROWS
+    assert RollupService.diff() == []
+
+    # tracemalloc slows allocation down, so peak memory is measured on a second run
+    tracemalloc.start()
+    try:
+        run_import(client, auth_headers, category)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    print(
+        f'\nimported {IMPORT_BENCHMARK_ROWS} rows ({body_size / 2**20:.1f} MiB) in {elapsed:.2f}s: '
+        f'{IMPORT_BENCHMARK_ROWS / elapsed:.0f} rows/s, peak Python memory {peak / 2**20:.1f} MiB'
+    )
+    # Streaming keeps memory bounded by the batch, not the upload
+    assert peak < body_size
@@ -0,0 +1,43 @@
+from models import Transaction, RecurringTransaction, Budget
+
+def test_amount_keyword_sets_minor_units():
+    assert Transaction(amount=12.34).amount_minor == 1234
+    assert RecurringTransaction(amount='0.1').amount_minor == 10
+    assert Budget(amount=500).amount_minor == 50000
+
+def test_amount_expression_is_sql():
+    assert str(Transaction.amount.compile()).startswith('transaction.amount_minor /')
+
+def test_create_transaction_endpoint(client, auth_headers, category):
+    response = client.post('/transactions', headers=auth_headers, json={
+        'amount': 12.34,
+        'description': 'Cà phê',
+        'category_id': category.id,
+        'date': '2026-01-15T08:00:00'
+    })
+    assert response.status_code == 201
+    assert response.get_json()['amount'] == 12.34
+    assert Transaction.query.one().amount_minor == 1234
+
+def test_create_recurring_transaction_endpoint(client, auth_headers, category):
+    response = client.post('/transactions', headers=auth_headers, json={
+        'amount': 99.99,
+        'description': 'Internet',
+        'category_id': category.id,
+        'date': '2026-01-31T00:00:00',
+        'isRecurring': True,
+        'frequency': 'monthly'
+    })
+    assert response.status_code == 201
+    assert response.get_json()['recurring']['amount'] == 99.99
+
+def test_create_budget_endpoint(client, auth_headers, category):
+    response = client.post('/budgets', headers=auth_headers, json={
+        'amount': 250.5,
+        'category_id': category.id,
+        'start_date': '2026-01-01',
+        'end_date': '2026-01-31'
+    })
+    assert response.status_code == 201
+    assert response.get_json()['amount'] == 250.5
+    assert Budget.query.one().amount_minor == 25050
@@ -0,0 +1,31 @@
+import base64
+import json
+import pytest
+from datetime import datetime
+from services.pagination_service import PaginationService
+
+def raw_cursor(value):
+    return base64.urlsafe_b64encode(json.dumps(value).encode('utf-8')).decode('ascii')
+
+MALFORMED_CURSORS = ['not base64!', raw_cursor({'id': 1}), raw_cursor([]), raw_cursor(['2026-01-01T00:00:00']), raw_cursor('x')]
+
+def test_cursor_round_trip():
+    cursor = PaginationService.encode_cursor(datetime(2026, 1, 15, 10, 30), 42)
+    assert PaginationService.decode_cursor(cursor, 2) == ['2026-01-15T10:30:00', 42]
+
+@pytest.mark.parametrize('cursor', MALFORMED_CURSORS)
+def test_decode_cursor_rejects_wrong_shape(cursor):
+    with pytest.raises(ValueError):
+        PaginationService.decode_cursor(cursor, 2)
+
+@pytest.mark.parametrize('cursor', MALFORMED_CURSORS + [raw_cursor([{}, 1]), raw_cursor(['2026-01-01T00:00:00', [1]])])
+def test_transactions_reject_malformed_cursor(client, auth_headers, cursor):
+    response = client.get('/transactions', headers=auth_headers, query_string={'cursor': cursor})
+    assert response.status_code == 400
+
+@pytest.mark.parametrize('cursor', MALFORMED_CURSORS + [raw_cursor([1, 2]), raw_cursor([[1]])])
+def test_users_reject_malformed_cursor(client, db, user, auth_headers, cursor):
+    user.is_admin = True
+    db.session.commit()
+    response = client.get('/users', headers=auth_headers, query_string={'cursor': cursor})
+    assert response.status_code == 400
@@ -0,0 +1,74 @@
+import os
+import time
+import pytest
+from werkzeug.security import generate_password_hash
+from config import Config
+from services.password_service import PasswordService
+
+@pytest.fixture
+def hash_method(monkeypatch):
+    def use(method):
+        monkeypatch.setattr(Config, 'PASSWORD_HASH_METHOD', method)
+        monkeypatch.setattr(PasswordService, '_method_prefix', None)
+    return use
+
+@pytest.mark.parametrize('method', ['scrypt', 'pbkdf2:sha256', 'pbkdf2:sha256:600000'])
+def test_fresh_hash_does_not_need_rehash(hash_method, method):
+    hash_method(method)
+    assert not PasswordService.needs_rehash(PasswordService.hash_password('secret'))
+
+def test_hash_with_other_parameters_needs_rehash(hash_method):
+    hash_method('pbkdf2:sha256:600000')
+    assert PasswordService.needs_rehash(generate_password_hash('secret', 'pbkdf2:sha256:1000'))
+
+@pytest.fixture
+def login_user(db):
+    from models import User
+    user = User(email='login@example.com', name='Login User')
+    user.set_password('secret')
+    db.session.add(user)
+    db.session.commit()
+    return {'email': user.email, 'password': 'secret'}
+
+def test_login_returns_503_when_hasher_is_saturated(client, login_user, monkeypatch):
+    monkeypatch.setattr(Config, 'PASSWORD_HASH_QUEUE_TIMEOUT', 0.01)
+    taken = 0
+    while PasswordService._slots.acquire(blocking=False):
+        taken += 1
+    try:
+        response = client.post('/auth/login', json=login_user)
+    finally:
+        for _ in range(taken):
+            PasswordService._slots.release()
+
+    assert response.status_code == 503
+    assert response.get_json() == {'error': 'Server busy, please retry'}
+    assert client.post('/auth/login', json=login_user).status_code == 200
+
+@pytest.mark.skipif(not os.environ.get('RUN_BENCHMARKS'), reason='RUN_BENCHMARKS is not set')
+def test_login_throughput_under_concurrency(app, client, login_user):
+    from concurrent.futures import ThreadPoolExecutor
+
+    def login(_):
+        started = time.perf_counter()
+        status = app.test_client().post('/auth/login', json=login_user).status_code
+        return status, time.perf_counter() - started
+
+    client.post('/auth/login', json=login_user)
+    print(f'\n{Config.PASSWORD_HASH_METHOD}, {Config.PASSWORD_HASH_WORKERS} hash workers, '
+          f'queue {Config.PASSWORD_HASH_QUEUE_SIZE}, timeout {Config.PASSWORD_HASH_QUEUE_TIMEOUT}s')
+    for concurrency in (1, 4, 16, 64):
+        requests = max(concurrency, 16)
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            results = list(pool.map(login, range(requests)))
+        elapsed = time.perf_counter() - started
+
+        latencies = sorted(latency for status, latency in results if status == 200)
+        ok = len(latencies)
+        busy = sum(1 for status, _ in results if status == 503)
+        assert ok + busy == requests
+        print(
+            f'concurrency {concurrency:>2}: {ok / elapsed:.1f} logins/s, {busy} x 503, '
+            f'p50 {latencies[ok // 2] * 1000:.0f} ms, p95 {latencies[int(ok * 0.95) - 1 if ok > 1 else 0] * 1000:.0f} ms'
+        )
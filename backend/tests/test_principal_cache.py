@@ -0,0 +1,59 @@
+import os
+import time
+import pytest
+from models import User
+from routes.auth import create_token, user_cache
+
+@pytest.fixture
+def admin_headers(db):
+    admin = User(email='admin@example.com', name='Admin', is_admin=True)
+    db.session.add(admin)
+    db.session.commit()
+    return {'Authorization': f'Bearer {create_token(admin)}'}
+
+def test_toggle_admin_evicts_cached_principal(client, user, auth_headers, admin_headers):
+    assert client.get('/users', headers=auth_headers).status_code == 403
+    assert user_cache.get(user.id) is not None
+
+    response = client.put(f'/users/{user.id}/toggle-admin', headers=admin_headers)
+    assert response.get_json()['is_admin'] is True
+    assert user_cache.get(user.id) is None
+    # The old token is still valid, but the principal is reloaded with the new role
+    assert client.get('/users', headers=auth_headers).status_code == 200
+
+def test_delete_evicts_cached_principal(client, user, auth_headers, admin_headers):
+    user_id = user.id
+    assert client.get('/categories', headers=auth_headers).status_code == 200
+    assert user_cache.get(user_id) is not None
+
+    assert client.delete(f'/users/{user_id}', headers=admin_headers).status_code == 200
+    assert user_cache.get(user_id) is None
+    assert client.get('/categories', headers=auth_headers).status_code == 401
+
+@pytest.mark.skipif(not os.environ.get('RUN_BENCHMARKS'), reason='RUN_BENCHMARKS is not set')
+def test_principal_cache_throughput(db, client, auth_headers, category, count_statements, monkeypatch):
+    requests = int(os.environ.get('PRINCIPAL_BENCHMARK_REQUESTS', 2000))
+
+    def measure():
+        assert client.get('/categories', headers=auth_headers).status_code == 200
+        with count_statements() as statements:
+            started = time.perf_counter()
+            for _ in range(requests):
+                client.get('/categories', headers=auth_headers)
+                # Requests share the test's app context; start each with a fresh session as in production
+                db.session.remove()
+            elapsed = time.perf_counter() - started
+        return requests / elapsed, len(statements) / requests
+
+    cached_rate, cached_statements = measure()
+    # Entries that expire on arrival: every request loads the user again
+    monkeypatch.setattr(user_cache, 'ttl', 0)
+    user_cache.clear()
+    uncached_rate, uncached_statements = measure()
+
+    print(
+        f'\nGET /categories x{requests}: {cached_rate:.0f} req/s with the principal cache '
+        f'({cached_statements:.1f} statements/request), {uncached_rate:.0f} req/s without '
+        f'({uncached_statements:.1f} statements/request)'
+    )
+    assert cached_statements < uncached_statements
@@ -0,0 +1,64 @@
+from datetime import datetime
+import pytest
+from sqlalchemy import event
+from werkzeug.datastructures import MultiDict
+from routes.transactions import build_transaction_query
+from services.budget_service import BudgetService
+
+def index_conditions(db, run):
+    """
+    Run `run`, EXPLAIN every statement it executed and return a dict mapping
+    each index used to its index conditions. Sequential scans are disabled so
+    the plan shows whether an index can serve the predicates at all, even on
+    the near-empty test tables.
+    """
+    connection = db.session.connection()
+    connection.exec_driver_sql('SET LOCAL enable_seqscan = off')
+
+    statements = []
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(db.engine, 'before_cursor_execute', capture)
+    try:
+        run()
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', capture)
+
+    indexes = {}
+    def walk(node):
+        if 'Index Name' in node:
+            indexes.setdefault(node['Index Name'], []).append(node.get('Index Cond', ''))
+        for child in node.get('Plans', []):
+            walk(child)
+
+    for statement, parameters in statements:
+        plan = connection.exec_driver_sql('EXPLAIN (FORMAT JSON) ' + statement, parameters).scalar()
+        walk(plan[0]['Plan'])
+    return indexes
+
+def assert_range_scan(indexes, name, column):
+    assert name in indexes, f'{name} not used; plans used {sorted(indexes)}'
+    assert any(column in condition for condition in indexes[name]), \
+        f'{column} is filtered, not part of the {name} index condition: {indexes[name]}'
+
+def test_budget_progress_uses_budget_index(db, user, category):
+    indexes = index_conditions(db, lambda: BudgetService.get_budget_progress(user.id, 2026, 1))
+    assert_range_scan(indexes, 'ix_budget_user_start_date', 'start_date')
+
+def test_budget_check_uses_budget_index(db, user, category):
+    indexes = index_conditions(db, lambda: BudgetService.get_budget_progress(
+        user.id, 2026, 1, category_id=category.id
+    ))
+    assert_range_scan(indexes, 'ix_budget_user_start_date', 'start_date')
+
+def test_batched_budget_check_uses_budget_index(db, user, category):
+    indexes = index_conditions(db, lambda: BudgetService.check_budgets(
+        user.id, [(category.id, datetime(2026, 1, 15)), (category.id, datetime(2026, 3, 2))]
+    ))
+    assert_range_scan(indexes, 'ix_budget_user_start_date', 'start_date')
+
+def test_category_transaction_lookup_uses_transaction_index(db, user, category):
+    args = MultiDict({'category_id': str(category.id), 'month': '1', 'year': '2026'})
+    indexes = index_conditions(db, lambda: build_transaction_query(user, args).all())
+    assert_range_scan(indexes, 'ix_transaction_user_category_created_at', 'created_at')
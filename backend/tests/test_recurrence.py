@@ -0,0 +1,129 @@
+import calendar
+import pytest
+from datetime import date, datetime, timedelta
+from models import recurrence, RecurringTransaction, Transaction
+from services.recurring_transaction_service import RecurringTransactionService
+
+def is_month_end(day):
+    return day.day == calendar.monthrange(day.year, day.month)[1]
+
+def test_monthly_occurrences_keep_day_of_month():
+    days = recurrence.occurrences(date(2026, 1, 31), 'monthly', date(2026, 1, 1), date(2027, 1, 1))
+    assert len(days) == 12
+    assert all(is_month_end(day) for day in days)
+
+def test_empty_index_range_starts_at_next_occurrence():
+    indices = recurrence.index_range(date(2026, 1, 5), 'weekly', date(2026, 1, 20), date(2026, 1, 20))
+    assert len(indices) == 0
+    assert recurrence.occurrence(date(2026, 1, 5), 'weekly', indices.stop) == date(2026, 1, 26)
+
+def test_window_counts_respects_end_date():
+    boundaries = [date(2026, 1, 1), date(2026, 2, 1), date(2026, 3, 1)]
+    assert recurrence.window_counts(date(2026, 1, 5), 'weekly', boundaries, date(2026, 2, 10)) == [4, 2]
+
+@pytest.mark.parametrize('frequency', recurrence.FREQUENCIES)
+@pytest.mark.parametrize('anchor', [date(2024, 2, 29), date(2025, 1, 31), date(2026, 3, 3), date(2027, 5, 1)])
+def test_window_counts_match_enumerated_occurrences(frequency, anchor):
+    boundaries = [date(2026, 2, 10)] + [recurrence.add_months(date(2026, 3, 1), offset) for offset in range(24)]
+    end_date = date(2027, 2, 28)
+    start = date(2026, 4, 15)
+    expected = [
+        len([day for day in recurrence.occurrences(anchor, frequency, begin, stop, end_date) if day >= start])
+        for begin, stop in zip(boundaries, boundaries[1:])
+    ]
+    assert recurrence.window_counts(anchor, frequency, boundaries, end_date, start=start) == expected
+
+def test_daily_job_does_not_drift_after_short_month():
+    origin = date(2026, 1, 31)
+    next_occurrence = RecurringTransactionService.calculate_next_occurrence('monthly', origin).date()
+    generated = []
+    day = origin
+    while day < date(2027, 1, 1):
+        day += timedelta(days=1)
+        if next_occurrence == day:
+            occurrences, next_occurrence = RecurringTransactionService.collect_occurrences(
+                'monthly', origin, next_occurrence, day
+            )
+            generated.extend(occurrences)
+    assert len(generated) == 11
+    assert all(is_month_end(day) for day in generated)
+
+def test_model_and_generator_agree(client, auth_headers, category):
+    response = client.post('/transactions', headers=auth_headers, json={
+        'amount': 300,
+        'description': 'Tiền nhà',
+        'category_id': category.id,
+        'date': '2025-01-31T00:00:00',
+        'isRecurring': True,
+        'frequency': 'monthly'
+    })
+    assert response.status_code == 201
+
+    RecurringTransactionService.generate_pending_transactions(catch_up=True)
+
+    schedule = RecurringTransaction.query.one()
+    generated = [row.occurrence_date for row in Transaction.query.filter(
+        Transaction.recurring_transaction_id == schedule.id
+    )]
+    assert generated
+    assert all(is_month_end(day) for day in generated)
+    assert is_month_end(schedule.next_occurrence)
+    assert schedule.calculate_next_occurrence == schedule.next_occurrence
+
+def test_upcoming_and_projection_endpoints(client, auth_headers, category):
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    client.post('/transactions', headers=auth_headers, json={
+        'amount': 10,
+        'description': 'Báo',
+        'category_id': category.id,
+        'date': today.isoformat(),
+        'isRecurring': True,
+        'frequency': 'weekly'
+    })
+
+    upcoming = client.get('/transactions/recurring/upcoming?days=28', headers=auth_headers).get_json()
+    assert [item['date'] for item in upcoming['occurrences']] == [
+        (today + timedelta(weeks=weeks)).date().isoformat() for weeks in (1, 2, 3)
+    ]
+
+    projection = client.get('/transactions/recurring/projection?months=3', headers=auth_headers).get_json()
+    assert len(projection['months']) == 3
+    assert projection['total'] == 10 * sum(month['count'] for month in projection['months'])
+
+def add_due_schedule(db, user, category):
+    schedule = RecurringTransaction(
+        user_id=user.id, category_id=category.id, amount=20, description='Gym',
+        frequency='weekly', created_at=datetime(2026, 1, 5), next_occurrence=date(2026, 1, 12),
+        is_active=True
+    )
+    db.session.add(schedule)
+    db.session.commit()
+    return schedule
+
+def test_generate_recurring_command_reports_each_schedule(app, db, user, category):
+    schedule = add_due_schedule(db, user, category)
+
+    result = app.test_cli_runner().invoke(args=['generate-recurring'])
+    assert result.exit_code == 0, result.output
+    generated = Transaction.query.filter_by(recurring_transaction_id=schedule.id).count()
+    assert f"recurring transaction {schedule.id}: {generated} generated" in result.output
+    assert f"Generated {generated} recurring transactions for 1 schedules" in result.output
+
+def test_generation_reports_skipped_while_locked(app, db, user, category, caplog):
+    from sqlalchemy import text
+    from app import run_recurring_generation
+    from services.recurring_transaction_service import GENERATION_LOCK_KEY
+    add_due_schedule(db, user, category)
+
+    with db.engine.connect() as holder:
+        holder.execute(text('SELECT pg_advisory_lock(:key)'), {'key': GENERATION_LOCK_KEY})
+        try:
+            result = app.test_cli_runner().invoke(args=['generate-recurring'])
+            with caplog.at_level('INFO', logger='services.recurring_transaction_service'):
+                assert run_recurring_generation() is None
+        finally:
+            holder.execute(text('SELECT pg_advisory_unlock(:key)'), {'key': GENERATION_LOCK_KEY})
+
+    assert 'Skipped: recurring transaction generation is already running elsewhere' in result.output
+    assert 'skipped' in caplog.text
+    assert Transaction.query.count() == 0
@@ -0,0 +1,29 @@
+import time
+from services.replica_router import ReplicaRouter
+
+def test_wrote_recently_window():
+    router = ReplicaRouter()
+    router.read_your_writes = 10
+    now = time.time()
+    assert router.wrote_recently(str(now - 1))
+    assert not router.wrote_recently(str(now - 60))
+    assert not router.wrote_recently(str(now + 3600))
+    assert not router.wrote_recently('garbage')
+    assert not router.wrote_recently(None)
+
+def test_committing_request_stamps_last_write(client, auth_headers, category):
+    response = client.post('/transactions', headers=auth_headers, json={
+        'amount': 5,
+        'description': 'Bánh mì',
+        'category_id': category.id
+    })
+    assert response.status_code == 201
+    assert ReplicaRouter.LAST_WRITE_HEADER in response.headers
+
+def test_read_only_post_does_not_stamp_last_write(client, auth_headers, category):
+    response = client.post('/budgets/check', headers=auth_headers, json={
+        'category_id': category.id,
+        'date': '2026-01-15'
+    })
+    assert response.status_code == 200
+    assert ReplicaRouter.LAST_WRITE_HEADER not in response.headers
@@ -0,0 +1,82 @@
+import json
+from datetime import date, datetime
+import pytest
+from models import Category, RecurringTransaction, Transaction, MonthlyCategoryTotal
+from services.recurring_transaction_service import RecurringTransactionService
+from services.rollup_service import RollupService
+
+@pytest.fixture
+def other_category(db):
+    category = Category(name='Đi lại')
+    db.session.add(category)
+    db.session.commit()
+    return category
+
+def create(client, auth_headers, category, amount, when):
+    response = client.post('/transactions', headers=auth_headers, json={
+        'amount': amount, 'description': 'x', 'category_id': category.id, 'date': when
+    })
+    assert response.status_code == 201
+    return response.get_json()['id']
+
+def assert_rollup_consistent():
+    assert RollupService.diff() == []
+
+def test_create(client, auth_headers, category):
+    create(client, auth_headers, category, 12.34, '2026-01-15T10:00:00')
+    create(client, auth_headers, category, 0.66, '2026-01-20T10:00:00')
+    assert_rollup_consistent()
+    assert MonthlyCategoryTotal.query.one().total_minor == 1300
+
+def test_update_amount_month_and_category(client, auth_headers, category, other_category):
+    transaction_id = create(client, auth_headers, category, 10, '2026-01-31T23:00:00')
+    response = client.put(f'/transactions/{transaction_id}', headers=auth_headers, json={
+        'amount': 25.5, 'category_id': other_category.id, 'date': '2026-02-01T08:00:00'
+    })
+    assert response.status_code == 200
+    assert_rollup_consistent()
+
+def test_delete(client, auth_headers, category):
+    transaction_id = create(client, auth_headers, category, 10, '2026-01-15T10:00:00')
+    create(client, auth_headers, category, 5, '2026-01-16T10:00:00')
+    assert client.delete(f'/transactions/{transaction_id}', headers=auth_headers).status_code == 204
+    assert_rollup_consistent()
+
+def test_batch(client, auth_headers, category, other_category):
+    first = create(client, auth_headers, category, 10, '2026-01-15T10:00:00')
+    second = create(client, auth_headers, category, 20, '2026-02-15T10:00:00')
+    response = client.post('/transactions/batch', headers=auth_headers, json={'operations': [
+        {'op': 'create', 'data': {'amount': 7, 'category_id': other_category.id, 'date': '2026-03-01T00:00:00'}},
+        {'op': 'update', 'id': first, 'data': {'amount': 11, 'category_id': other_category.id, 'date': '2026-02-28T12:00:00'}},
+        {'op': 'delete', 'id': second}
+    ]})
+    assert response.get_json()['applied'] is True
+    assert_rollup_consistent()
+
+def test_import(client, auth_headers, category):
+    rows = [
+        {'amount': 1.5, 'category_id': category.id, 'date': f'2026-{month:02d}-10T00:00:00'}
+        for month in (1, 1, 2, 3)
+    ] + [{'amount': 'bad', 'category_id': category.id}]
+    response = client.post(
+        '/transactions/import?batch_size=2',
+        headers=auth_headers,
+        data='\n'.join(json.dumps(row) for row in rows),
+        content_type='application/x-ndjson'
+    )
+    assert response.get_json()['imported'] == 4
+    assert_rollup_consistent()
+
+def test_recurring_generation(db, user, category):
+    db.session.add(RecurringTransaction(
+        user_id=user.id, category_id=category.id, amount=9.99, description='Nhạc',
+        frequency='weekly', created_at=datetime(2025, 12, 1), next_occurrence=date(2025, 12, 8),
+        is_active=True
+    ))
+    db.session.commit()
+
+    created = RecurringTransactionService.generate_pending_transactions(catch_up=True)
+    assert sum(created.values()) == Transaction.query.count() > 0
+    # A rerun inserts nothing and must not touch the rollup either
+    RecurringTransactionService.generate_pending_transactions(catch_up=True)
+    assert_rollup_consistent()
@@ -0,0 +1,41 @@
+from datetime import datetime, timedelta
+from sqlalchemy import insert
+from models import Category, Transaction
+
+def add_transactions(db, user, count=1000):
+    categories = [Category(name=f'Danh mục {index}') for index in range(10)]
+    db.session.add_all(categories)
+    db.session.flush()
+    start = datetime(2026, 1, 1)
+    db.session.execute(insert(Transaction), [{
+        'user_id': user.id,
+        'category_id': categories[index % len(categories)].id,
+        'amount_minor': 100 + index,
+        'description': f'Giao dịch {index}',
+        'created_at': start + timedelta(minutes=index),
+        'updated_at': start
+    } for index in range(count)])
+    db.session.commit()
+
+def test_serializing_transactions_does_not_query_per_row(db, user, count_statements):
+    add_transactions(db, user)
+    transactions = Transaction.query.filter_by(user_id=user.id).all()
+
+    with count_statements() as statements:
+        serialized = [transaction.to_dict() for transaction in transactions]
+
+    assert len(serialized) == 1000
+    assert all(row['category'] is not None for row in serialized)
+    # At most one load of the category cache, however many rows there are
+    assert len(statements) <= 1
+
+def test_listing_transactions_uses_constant_statements(client, db, user, auth_headers, count_statements):
+    add_transactions(db, user)
+
+    with count_statements() as statements:
+        response = client.get('/transactions', headers=auth_headers)
+
+    assert response.status_code == 200
+    assert len(response.get_json()) == 1000
+    # Principal lookup, the listing itself and one category cache load
+    assert len(statements) <= 3
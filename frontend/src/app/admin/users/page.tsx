@@ -11,6 +11,7 @@ import {
   TableRow,
 } from "@/components/ui/table";
 import { Button } from "@/components/ui/button";
+import { Input } from "@/components/ui/input";
 import {
   AlertDialog,
   AlertDialogAction,
@@ -30,20 +31,39 @@ interface User {
   name: string;
 }
 
+const PAGE_SIZE = 100;
+
 export default function AdminUsersPage() {
   const [users, setUsers] = useState<User[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [search, setSearch] = useState('');
   const [isLoading, setIsLoading] = useState(true);
+  const [isLoadingMore, setIsLoadingMore] = useState(false);
   const [userToDelete, setUserToDelete] = useState<User | null>(null);
 
-  const fetchUsers = async () => {
+  const fetchUsers = async (cursor: string | null = null) => {
+    const params = new URLSearchParams({ page_size: String(PAGE_SIZE) });
+    if (search.trim()) {
+      params.set('q', search.trim());
+    }
+    if (cursor) {
+      params.set('cursor', cursor);
+    }
+
     try {
-      setIsLoading(true);
-      const data = await fetchApi('/users');
-      setUsers(data);
+      if (cursor) {
+        setIsLoadingMore(true);
+      } else {
+        setIsLoading(true);
+      }
+      const data = await fetchApi(`/users?${params.toString()}`);
+      setUsers((current) => (cursor ? [...current, ...data.users] : data.users));
+      setNextCursor(data.next_cursor);
     } catch (error) {
       console.error('Error fetching users:', error);
     } finally {
       setIsLoading(false);
+      setIsLoadingMore(false);
     }
   };
 
@@ -53,7 +73,12 @@ export default function AdminUsersPage() {
         method: 'PUT',
         body: JSON.stringify({ is_admin: !currentStatus }),
       });
-      fetchUsers();
+      // Update in place so pages loaded with "Load more" are kept
+      setUsers((current) =>
+        current.map((user) =>
+          user.id === userId ? { ...user, is_admin: !currentStatus } : user
+        )
+      );
     } catch (error) {
       console.error('Error toggling admin status:', error);
     }
@@ -64,63 +89,84 @@ export default function AdminUsersPage() {
       await fetchApi(`/users/${user.id}`, {
         method: 'DELETE',
       });
-      fetchUsers();
+      setUsers((current) => current.filter((u) => u.id !== user.id));
       setUserToDelete(null);
     } catch (error) {
       console.error('Error deleting user:', error);
     }
   };
 
+  // Reload from the first page when the search changes, after a short pause
   useEffect(() => {
-    fetchUsers();
-  }, []);
-
-  if (isLoading) {
-    return <div className="p-4">Loading...</div>;
-  }
+    const timeout = setTimeout(() => fetchUsers(), 300);
+    return () => clearTimeout(timeout);
+  }, [search]);
 
   return (
     <div className="p-4">
       <h1 className="text-2xl font-bold mb-4">Manage Users</h1>
+
+      <Input
+        className="mb-4 max-w-sm"
+        placeholder="Search by email or name"
+        value={search}
+        onChange={(e) => setSearch(e.target.value)}
+      />
       
-      <div className="rounded-md border">
-        <Table>
-          <TableHeader>
-            <TableRow>
-              <TableHead>Email</TableHead>
-              <TableHead>Name</TableHead>
-              <TableHead>Admin Status</TableHead>
-              <TableHead>Actions</TableHead>
-            </TableRow>
-          </TableHeader>
-          <TableBody>
-            {users.map((user) => (
-              <TableRow key={user.id}>
-                <TableCell>{user.email}</TableCell>
-                <TableCell>{user.name}</TableCell>
-                <TableCell>
-                  <Button
-                    variant={user.is_admin ? "default" : "outline"}
-                    size="sm"
-                    onClick={() => handleToggleAdmin(user.id, user.is_admin)}
-                  >
-                    {user.is_admin ? "Admin" : "User"}
-                  </Button>
-                </TableCell>
-                <TableCell>
-                  <Button
-                    variant="destructive"
-                    size="sm"
-                    onClick={() => setUserToDelete(user)}
-                  >
-                    Delete
-                  </Button>
-                </TableCell>
+      {isLoading ? (
+        <div>Loading...</div>
+      ) : (
+        <div className="rounded-md border">
+          <Table>
+            <TableHeader>
+              <TableRow>
+                <TableHead>Email</TableHead>
+                <TableHead>Name</TableHead>
+                <TableHead>Admin Status</TableHead>
+                <TableHead>Actions</TableHead>
               </TableRow>
-            ))}
-          </TableBody>
-        </Table>
-      </div>
+            </TableHeader>
+            <TableBody>
+              {users.map((user) => (
+                <TableRow key={user.id}>
+                  <TableCell>{user.email}</TableCell>
+                  <TableCell>{user.name}</TableCell>
+                  <TableCell>
+                    <Button
+                      variant={user.is_admin ? "default" : "outline"}
+                      size="sm"
+                      onClick={() => handleToggleAdmin(user.id, user.is_admin)}
+                    >
+                      {user.is_admin ? "Admin" : "User"}
+                    </Button>
+                  </TableCell>
+                  <TableCell>
+                    <Button
+                      variant="destructive"
+                      size="sm"
+                      onClick={() => setUserToDelete(user)}
+                    >
+                      Delete
+                    </Button>
+                  </TableCell>
+                </TableRow>
+              ))}
+            </TableBody>
+          </Table>
+        </div>
+      )}
+
+      {!isLoading && nextCursor && (
+        <div className="mt-4 flex justify-center">
+          <Button
+            variant="outline"
+            onClick={() => fetchUsers(nextCursor)}
+            disabled={isLoadingMore}
+          >
+            {isLoadingMore ? "Loading..." : "Load more"}
+          </Button>
+        </div>
+      )}
 
       <AlertDialog 
         open={!!userToDelete} 
@@ -10,6 +10,8 @@ export async function fetchApi(endpoint: string, options: FetchOptions = {}) {
   const { method = "GET", body, headers = {} } = options;
 
   const token = localStorage.getItem("token");
+  // Echo the server's last write time so reads after a write skip lagging replicas
+  const lastWrite = localStorage.getItem("lastWrite");
   const response = await fetch(
     `${process.env.NEXT_PUBLIC_API_URL}${endpoint}`,
     {
@@ -17,12 +19,18 @@ export async function fetchApi(endpoint: string, options: FetchOptions = {}) {
       headers: {
         "Content-Type": "application/json",
         ...(token && { Authorization: `Bearer ${token.trim()}` }),
+        ...(lastWrite && { "X-Last-Write": lastWrite }),
         ...headers,
       },
       body: body ? JSON.stringify(body) : undefined,
     }
   );
 
+  const writtenAt = response.headers.get("X-Last-Write");
+  if (writtenAt) {
+    localStorage.setItem("lastWrite", writtenAt);
+  }
+
   if (method === "DELETE") {
     return { success: true };
   }